@@ -1,30 +1,51 @@
 import streamlit as st
 import asyncio
+import concurrent.futures
 import os
+import queue
 import sys
 import threading
 import time
-import json
 from pathlib import Path
 import uuid
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 # Fix path for imports
 try:
     from mcpclient.client import MCPClient
-    from mcpclient.llm.gpt4o import GptLLM
-    from mcpclient.llm.gemini import GeminiLLM
+    from mcpclient.history import SQLiteHistory
+    from mcpclient.llm import create_llm
 except ImportError:
     # When running as standalone
     parent_dir = str(Path(__file__).parent.parent)
     if parent_dir not in sys.path:
         sys.path.append(parent_dir)
     from mcpclient.client import MCPClient
-    from mcpclient.llm.gpt4o import GptLLM
-    from mcpclient.llm.gemini import GeminiLLM
+    from mcpclient.history import SQLiteHistory
+    from mcpclient.llm import create_llm
 
-# Set Windows event loop policy
-if sys.platform.startswith("win"):
-    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+# uvloop is optional; where installed it replaces the default event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Chat history database, shared by all sessions
+HISTORY_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chat_history.db")
+# Sessions whose history is kept; older ones are deleted at startup
+HISTORY_MAX_SESSIONS = 100
+
+# MCP clients kept running across browser sessions; beyond this many, the
+# least recently used one is closed along with its servers
+CLIENT_MAX_SESSIONS = 16
+
+# Streamed text is handed to the UI once this many characters accumulate,
+# or after this many seconds, whichever comes first
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.05
+# Longest the UI waits for queued output before re-checking for completion
+STREAM_WAIT_TIMEOUT = 0.1
 
 # Page config
 st.set_page_config(page_title="MCP Client", page_icon="🤖", layout="wide")
@@ -38,55 +59,206 @@ if "available_servers" not in st.session_state:
     st.session_state.available_servers = []
 if "connected_server" not in st.session_state:
     st.session_state.connected_server = None
-if "chat_history" not in st.session_state:
-    st.session_state.chat_history = []
 if "is_processing" not in st.session_state:
     st.session_state.is_processing = False
 if "session_id" not in st.session_state:
-    # Generate a unique session ID for this Streamlit session
-    st.session_state.session_id = str(uuid.uuid4())
+    # The session ID is kept in the page URL, so reloading the page finds
+    # the same chat history
+    session_id = st.query_params.get("session")
+    if not session_id:
+        session_id = str(uuid.uuid4())
+        st.query_params["session"] = session_id
+    st.session_state.session_id = session_id
 if "llm_model" not in st.session_state:
     st.session_state.llm_model = "gpt"  # Default to GPT
+if "stream_q" not in st.session_state:
+    st.session_state.stream_q = None
+if "stream_done" not in st.session_state:
+    st.session_state.stream_done = None
+if "stream_future" not in st.session_state:
+    st.session_state.stream_future = None
+if "current_response" not in st.session_state:
+    # Text of the response being streamed, kept across reruns
+    st.session_state.current_response = ""
+
+
+class AsyncLoopThread:
+    """Persistent event loop running in a background thread
+
+    The connected client and its server subprocess live on this loop, so every
+    coroutine touching them must be submitted here.
+    """
+
+    def __init__(self):
+        self.loop = uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, daemon=True, name="mcp-loop"
+        )
+        self.thread.start()
+
+    def submit(self, coro) -> concurrent.futures.Future:
+        """Schedule a coroutine on the loop and return its future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
 
-# Create a directory for temporary files
-temp_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "temp")
-os.makedirs(temp_dir, exist_ok=True)
+
+@st.cache_resource
+def get_loop_thread() -> AsyncLoopThread:
+    """Get the process-wide background event loop"""
+    return AsyncLoopThread()
+
+
+if "loop_thread" not in st.session_state:
+    st.session_state.loop_thread = get_loop_thread()
 
 
 # Run async code
 def run_async(coro):
-    """Run an async coroutine and return the result"""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
+    """Run an async coroutine on the background loop and return the result"""
+    return st.session_state.loop_thread.submit(coro).result()
+
+
+@st.cache_resource
+def get_history() -> SQLiteHistory:
+    """Get the chat history store, dropping the oldest sessions' history"""
+    history = SQLiteHistory(HISTORY_DB_PATH)
+    history.prune(HISTORY_MAX_SESSIONS)
+    return history
+
+
+if "chat_history" not in st.session_state:
+    # Read once per browser session, then kept in step with the database,
+    # so reruns replay it without querying SQLite
+    st.session_state.chat_history = get_history().load(st.session_state.session_id)
+
+
+def append_chat_message(role: str, content: str):
+    """Store a chat message for the current session"""
+    get_history().append(st.session_state.session_id, role, content)
+    st.session_state.chat_history.append({"role": role, "content": content})
+
+
+def clear_chat_history():
+    """Delete the current session's chat history"""
+    get_history().clear(st.session_state.session_id)
+    st.session_state.chat_history = []
+
+
+class ClientRegistry:
+    """MCP clients of all browser sessions, keyed by session ID
+
+    The session ID is kept in the page URL, so a reloaded page gets its client
+    back instead of leaving it running. Once more than ``max_clients`` are
+    held, the least recently used client is closed along with its servers.
+    """
+
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        self._clients: "OrderedDict[str, Tuple[tuple, MCPClient]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str, key: tuple) -> Optional[MCPClient]:
+        """Get a session's client if it was built for the given key"""
+        with self._lock:
+            entry = self._clients.get(session_id)
+            if entry is None or entry[0] != key:
+                return None
+            self._clients.move_to_end(session_id)
+            return entry[1]
+
+    def touch(self, session_id: str, client: MCPClient) -> bool:
+        """Mark a session's client as recently used
+
+        Returns:
+            False if the client has been replaced or closed
+        """
+        with self._lock:
+            entry = self._clients.get(session_id)
+            if entry is None or entry[1] is not client:
+                return False
+            self._clients.move_to_end(session_id)
+            return True
+
+    def put(self, session_id: str, key: tuple, client: MCPClient) -> None:
+        """Store a session's client, closing the one it replaces and any evicted"""
+        with self._lock:
+            old = self._clients.pop(session_id, None)
+            self._clients[session_id] = (key, client)
+            stale = [old[1]] if old is not None else []
+            while len(self._clients) > self.max_clients:
+                stale.append(self._clients.popitem(last=False)[1][1])
+
+        for stale_client in stale:
+            # Stop the old client's servers; it is no longer reachable
+            run_async(stale_client.close())
+
+
+@st.cache_resource
+def get_client_registry() -> ClientRegistry:
+    """Get the process-wide registry of MCP clients"""
+    return ClientRegistry(CLIENT_MAX_SESSIONS)
+
+
+def get_client(config_path: str) -> MCPClient:
+    """Get this session's MCP client for a configuration file
+
+    Each browser session has its own client, so connecting, disconnecting or
+    switching models in one tab leaves other tabs alone. The client is reused
+    until the path or the file changes, then replaced.
+    """
+    key = (os.path.abspath(config_path), os.stat(config_path).st_mtime_ns)
+    registry = get_client_registry()
+    session_id = st.session_state.session_id
+
+    client = registry.get(session_id, key)
+    if client is not None:
+        # Possibly left connected by this page before a reload
+        st.session_state.connected_server = client.active_server_name
+        return client
+
+    client = MCPClient(config_path=config_path)
+    st.session_state.client = None
+    st.session_state.connected_server = None
+    registry.put(session_id, key, client)
+    return client
+
+
+if st.session_state.client is not None and not get_client_registry().touch(
+    st.session_state.session_id, st.session_state.client
+):
+    # Closed after other pages pushed it out of the registry
+    st.session_state.client = None
+    st.session_state.connected_server = None
+    st.session_state.available_servers = []
 
 
 # Function to create and configure a new LLM instance based on selection
 def create_llm_instance(model_name):
     """Create a new LLM instance based on the selected model"""
     if model_name == "gemini":
-        return GeminiLLM()
+        return create_llm("gemini")
     else:  # default to GPT
-        return GptLLM()
+        return create_llm("gpt")
 
 
 # Load configuration file
 def load_config():
     """Load the configuration file and initialize the client"""
+    if st.session_state.is_processing:
+        st.warning("Wait for the current response to finish")
+        return
+
     try:
         path = st.session_state.config_input
         if not os.path.exists(path):
             st.error(f"Configuration file not found: {path}")
             return
 
-        # Create new client
-        client = MCPClient(config_path=path)
+        # Get client for this configuration
+        client = get_client(path)
 
         # Set the LLM model based on selection
         model_name = st.session_state.llm_model_select
+        run_async(client.llm.aclose())
         client.llm = create_llm_instance(model_name)
         st.session_state.llm_model = model_name
 
@@ -112,11 +284,18 @@ def load_config():
 # Change the LLM model
 def change_llm_model():
     """Change the LLM model for the current client"""
+    if st.session_state.is_processing:
+        # Keep the model the running stream is using
+        st.session_state.llm_model_select = st.session_state.llm_model
+        st.warning("Wait for the current response to finish")
+        return
+
     model_name = st.session_state.llm_model_select
     st.session_state.llm_model = model_name
 
     if st.session_state.client:
-        # Create new LLM instance based on selection
+        # Create new LLM instance based on selection, closing the old one
+        run_async(st.session_state.client.llm.aclose())
         st.session_state.client.llm = create_llm_instance(model_name)
         st.toast(f"Using {model_name.upper()} model")
 
@@ -136,19 +315,19 @@ def connect_to_server():
             st.info(f"Already connected to {server_name}")
             return
 
-        # Disconnect if connected to a different server
+        # Switch away from a different server, stopping it rather than
+        # keeping it alive until the client itself is closed
         if st.session_state.connected_server:
             run_async(st.session_state.client.disconnect())
             st.session_state.connected_server = None
-            st.session_state.chat_history = []
+            clear_chat_history()
 
         # Connect to the selected server
         with st.spinner(f"Connecting to {server_name}..."):
             run_async(st.session_state.client.connect_to_server(server_name))
 
-        # Update state
+        # Update state; history from before a page reload is kept
         st.session_state.connected_server = server_name
-        st.session_state.chat_history = []
     except Exception as e:
         st.error(f"Error connecting to server: {str(e)}")
 
@@ -166,107 +345,78 @@ def disconnect_from_server():
             run_async(st.session_state.client.disconnect())
 
         st.session_state.connected_server = None
-        st.session_state.chat_history = []
+        clear_chat_history()
 
         st.info(f"Disconnected from {server_name}")
     except Exception as e:
         st.error(f"Error disconnecting: {str(e)}")
 
 
-# Process query in a background thread
-def process_query_thread(config_path, server_name, query, session_id, llm_model):
-    """Process a query in a background thread using a new client instance"""
-    # Create temp files for this session
-    response_file = os.path.join(temp_dir, f"response_{session_id}.txt")
-    status_file = os.path.join(temp_dir, f"status_{session_id}.json")
-
-    # Initialize files
-    with open(response_file, "w", encoding="utf-8") as f:
-        f.write("")
-    with open(status_file, "w", encoding="utf-8") as f:
-        json.dump({"complete": False, "tool": None, "error": None}, f)
-
-    try:
-        # Create a new client instance specifically for this thread
-        # This avoids sharing event loops between threads
-        client = MCPClient(config_path=config_path)
-
-        # Set the LLM model based on the selected model
-        if llm_model == "gemini":
-            client.llm = GeminiLLM()
-        else:  # default to GPT
-            client.llm = GptLLM()
-
-        # Create a new event loop for this thread
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        # Define the async processing function
-        async def process_streaming():
-            # Connect to the server
-            try:
-                await client.connect_to_server(server_name)
-
-                # Full response accumulator
-                full_response = []
-                current_tool = None
-
-                # Process the streaming response
-                async for chunk in client.process_query_streaming(query):
-                    # Look for tool execution indicators
-                    if "Using tool:" in chunk:
-                        import re
-
-                        tool_match = re.search(r"Using tool: (\w+)", chunk)
-                        if tool_match:
-                            current_tool = tool_match.group(1)
-
-                    # Append chunk to response
-                    full_response.append(chunk)
+# Stream a query into the in-memory queue
+async def _stream_into_queue(client, query, stream_q, stream_done):
+    """Stream a query's response into a queue
 
-                    # Write current response to file
-                    with open(response_file, "w", encoding="utf-8") as f:
-                        f.write("".join(full_response))
+    Runs as a task on the shared event loop that owns the client's session.
+    Streamed output is pushed onto ``stream_q`` as ``("chunk", text)`` items and
+    ``stream_done`` is set once the response is complete.
+    """
 
-                    # Update status
-                    with open(status_file, "w", encoding="utf-8") as f:
-                        json.dump(
-                            {"complete": False, "tool": current_tool, "error": None}, f
-                        )
+    # Coalesce small text chunks so the UI drains fewer, larger items
+    pending = []
+    pending_len = 0
+    last_flush = time.monotonic()
 
-                # Streaming complete
-                with open(status_file, "w", encoding="utf-8") as f:
-                    json.dump({"complete": True, "tool": None, "error": None}, f)
+    def flush():
+        nonlocal pending_len, last_flush
+        if pending:
+            stream_q.put(("chunk", "".join(pending)))
+            pending.clear()
+        pending_len = 0
+        last_flush = time.monotonic()
 
-            except Exception as e:
-                # Handle streaming errors
-                error_msg = f"\n\nError: {str(e)}"
-                with open(response_file, "a", encoding="utf-8") as f:
-                    f.write(error_msg)
+    events = client.process_query_streaming(query)
+    next_event = None
 
-                with open(status_file, "w", encoding="utf-8") as f:
-                    json.dump({"complete": True, "tool": None, "error": str(e)}, f)
-
-            finally:
-                # Always disconnect
-                try:
-                    await client.disconnect()
-                except:
-                    pass
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(anext(events))
+
+            # Wait for the next event, but no longer than the flush window,
+            # so buffered text shows while the model pauses
+            timeout = None
+            if pending:
+                timeout = max(0.0, last_flush + STREAM_FLUSH_INTERVAL - time.monotonic())
+            done, _ = await asyncio.wait({next_event}, timeout=timeout)
+            if not done:
+                flush()
+                continue
+
+            event, next_event = next_event, None
+            try:
+                kind, payload = event.result()
+            except StopAsyncIteration:
+                break
 
-        # Run the async function
-        loop.run_until_complete(process_streaming())
+            text = client.format_stream_event(kind, payload)
+            pending.append(text)
+            pending_len += len(text)
 
-        # Clean up
-        loop.close()
+            if kind != "text" or pending_len >= STREAM_FLUSH_CHARS:
+                flush()
 
     except Exception as e:
-        # Handle thread-level errors
-        with open(response_file, "a", encoding="utf-8") as f:
-            f.write(f"\n\nThread Error: {str(e)}")
+        # Shown at the end of the response and kept with it in the history
+        pending.append(f"\n\nError: {str(e)}")
 
-        with open(status_file, "w", encoding="utf-8") as f:
-            json.dump({"complete": True, "tool": None, "error": str(e)}, f)
+    finally:
+        if next_event is not None:
+            # Let the cancelled step finish before closing the generator
+            next_event.cancel()
+            await asyncio.gather(next_event, return_exceptions=True)
+        await events.aclose()
+        flush()
+        stream_done.set()
 
 
 # Submit a query
@@ -282,68 +432,52 @@ def submit_query(query):
 
     # Update state
     st.session_state.is_processing = True
-    st.session_state.chat_history.append({"role": "user", "content": query})
-
-    # Get reference values
-    config_path = st.session_state.config_path
-    server_name = st.session_state.connected_server
-    session_id = st.session_state.session_id
-    llm_model = st.session_state.llm_model
-
-    # Start processing thread with isolated client
-    thread = threading.Thread(
-        target=process_query_thread,
-        args=(config_path, server_name, query, session_id, llm_model),
-        daemon=True,
+    append_chat_message("user", query)
+
+    # Fresh in-memory channel for this response
+    st.session_state.stream_q = queue.SimpleQueue()
+    st.session_state.stream_done = threading.Event()
+    st.session_state.current_response = ""
+
+    # Stream on the shared loop against the already-connected client
+    st.session_state.stream_future = st.session_state.loop_thread.submit(
+        _stream_into_queue(
+            st.session_state.client,
+            query,
+            st.session_state.stream_q,
+            st.session_state.stream_done,
+        )
     )
-    thread.start()
 
     # Force UI update
     st.rerun()
 
 
-def check_streaming_status():
-    """Check the status of streaming response"""
-    if not st.session_state.is_processing:
-        return False
+def stream_chunks():
+    """Yield streamed response text until the response is complete
 
-    session_id = st.session_state.session_id
-    response_file = os.path.join(temp_dir, f"response_{session_id}.txt")
-    status_file = os.path.join(temp_dir, f"status_{session_id}.json")
+    Blocks on the queue between items, so new output is yielded as soon as
+    it arrives. Text is recorded in ``current_response`` as it is taken off
+    the queue; a rerun mid-stream replays it before resuming the queue.
+    """
+    stream_q = st.session_state.stream_q
+    stream_done = st.session_state.stream_done
 
-    # Default values
-    current_response = ""
-    is_complete = False
-    current_tool = None
-    error = None
+    if st.session_state.current_response:
+        yield st.session_state.current_response
 
-    # Read current response
-    if os.path.exists(response_file):
+    while True:
         try:
-            with open(response_file, "r", encoding="utf-8") as f:
-                current_response = f.read()
-        except Exception as e:
-            st.error(f"Error reading response file: {e}")
+            kind, value = stream_q.get(timeout=STREAM_WAIT_TIMEOUT)
+        except queue.Empty:
+            # Everything is queued before the done flag is set
+            if stream_done.is_set() and stream_q.empty():
+                return
+            continue
 
-    # Read status
-    if os.path.exists(status_file):
-        try:
-            with open(status_file, "r", encoding="utf-8") as f:
-                status = json.load(f)
-                is_complete = status.get("complete", False)
-                current_tool = status.get("tool")
-                error = status.get("error")
-        except Exception as e:
-            st.error(f"Error reading status file: {e}")
-            is_complete = True  # Force completion on error
-
-    # Return a dictionary with the status info
-    return {
-        "complete": is_complete,
-        "response": current_response,
-        "tool": current_tool,
-        "error": error
-    }
+        if kind == "chunk":
+            st.session_state.current_response += value
+            yield value
 
 
 with st.sidebar:
@@ -353,7 +487,13 @@ with st.sidebar:
     st.header("Configuration")
     st.text_input("Config Path", value=st.session_state.config_path, key="config_input")
     # Load configuration button
-    st.button("Load Configuration", on_click=load_config,type="secondary")
+    # Both replace the LLM, which would close its client under a running stream
+    st.button(
+        "Load Configuration",
+        on_click=load_config,
+        type="secondary",
+        disabled=st.session_state.is_processing,
+    )
     # LLM Model selection
     st.header("LLM Model")
     model_options = ["gpt", "gemini"]
@@ -362,7 +502,8 @@ with st.sidebar:
         options=model_options,
         index=model_options.index(st.session_state.llm_model),
         key="llm_model_select",
-        on_change=change_llm_model
+        on_change=change_llm_model,
+        disabled=st.session_state.is_processing,
     )
 
 
@@ -419,13 +560,14 @@ else:
     st.success(f"Connected to {st.session_state.connected_server} using {st.session_state.llm_model.upper()} model")
 
 # Chat history (including current streaming message if applicable)
-for i, message in enumerate(st.session_state.chat_history):
+chat_history = st.session_state.chat_history
+for i, message in enumerate(chat_history):
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
     # If this is the last user message and we're processing, show assistant response right after
     if (st.session_state.is_processing and
-        i == len(st.session_state.chat_history) - 1 and
+        i == len(chat_history) - 1 and
         message["role"] == "user"):
         # Streaming response will come next
         pass  # The streaming section below will handle showing the response
@@ -434,46 +576,13 @@ for i, message in enumerate(st.session_state.chat_history):
 # Streaming response (if processing)
 if st.session_state.is_processing:
     with st.chat_message("assistant"):
-        message_placeholder = st.empty()
-        status_placeholder = st.empty()
+        st.write_stream(stream_chunks())
 
-        # Initialize last response length to track changes
-        last_response_length = 0
-
-        while True:
-            # Get the latest status and response
-            status = check_streaming_status()
-
-            # Show response if we have one
-            if status and "response" in status:
-                current_response = status["response"]
-
-                # Only update if the response has changed
-                if len(current_response) != last_response_length:
-                    # Add cursor or tool indicator
-                    display_text = current_response
-                    if status.get("tool"):
-                        display_text += f" (Executing tool {status['tool']}...)"
-                    else:
-                        display_text += "▌" if not status.get("complete") else ""
-
-                    # Update the message placeholder
-                    message_placeholder.markdown(display_text)
-                    last_response_length = len(current_response)
-
-                # Show error if there is one
-                if status.get("error"):
-                    status_placeholder.error(f"Error: {status['error']}")
-
-                # If complete, add to chat history and break the loop
-                if status.get("complete", False):
-                    # Add the final response to chat history
-                    st.session_state.chat_history.append({"role": "assistant", "content": current_response})
-                    st.session_state.is_processing = False
-                    break
-
-            # Brief pause before checking again
-            time.sleep(0.3)
+    # Add the final response to chat history
+    append_chat_message("assistant", st.session_state.current_response)
+    st.session_state.current_response = ""
+    st.session_state.is_processing = False
+    st.rerun()
 
 # Chat input
 disabled_chat = not st.session_state.connected_server or st.session_state.is_processing
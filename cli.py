@@ -1,9 +1,122 @@
 import asyncio
+import logging
+import os
 import sys
-import traceback
+import threading
+from typing import Optional
 
 from mcpclient.client import MCPClient
 
+# uvloop is optional; where installed it replaces the default event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+logger = logging.getLogger(__name__)
+
+# Lines arriving this many seconds after a query are batched with it, which
+# catches multi-line pastes without delaying typed queries noticeably
+QUERY_BATCH_WINDOW = 0.05
+QUERY_BATCH_MAX = 8
+
+COMMANDS = ("quit", "servers", "debug", "refresh-tools")
+
+# Lines read from stdin, or None once input has ended; created on first read
+_stdin_lines: Optional[asyncio.Queue] = None
+
+
+def _read_stdin(loop: asyncio.AbstractEventLoop, lines: asyncio.Queue) -> None:
+    """Feed stdin lines to the event loop until input ends
+
+    Runs on a daemon thread reading the raw file descriptor. A read still
+    waiting for a line at exit then neither holds up shutdown, as an
+    executor job would, nor holds the lock of sys.stdin's buffer.
+    """
+    encoding = sys.stdin.encoding or "utf-8"
+    buffer = b""
+    while True:
+        try:
+            chunk = os.read(sys.stdin.fileno(), 4096)
+        except OSError:
+            chunk = b""
+
+        if chunk:
+            *complete, buffer = (buffer + chunk).split(b"\n")
+        else:
+            complete = [buffer] if buffer else []
+            complete.append(None)
+
+        try:
+            for line in complete:
+                if line is not None:
+                    line = line.decode(encoding, errors="replace")
+                loop.call_soon_threadsafe(lines.put_nowait, line)
+        except RuntimeError:
+            # The loop closed while waiting for input
+            return
+
+        if not chunk:
+            return
+
+
+async def ainput(prompt: str, timeout: Optional[float] = None) -> Optional[str]:
+    """Read a line from stdin without blocking the event loop
+
+    Returns None if no line arrives within timeout seconds.
+
+    Raises:
+        EOFError: If input has ended
+    """
+    global _stdin_lines
+    if _stdin_lines is None:
+        _stdin_lines = asyncio.Queue()
+        threading.Thread(
+            target=_read_stdin,
+            args=(asyncio.get_running_loop(), _stdin_lines),
+            daemon=True,
+            name="stdin-reader",
+        ).start()
+
+    if prompt:
+        print(prompt, end="", flush=True)
+
+    try:
+        line = await asyncio.wait_for(_stdin_lines.get(), timeout)
+    except asyncio.TimeoutError:
+        return None
+
+    if line is None:
+        # Leave the marker for later reads, which also hit the end of input
+        _stdin_lines.put_nowait(None)
+        raise EOFError("EOF when reading a line")
+    return line.strip()
+
+
+async def read_query() -> str:
+    """Read a query, batching lines pasted together with it into one query"""
+    query = await ainput("\n🔍 Query: ")
+    if query.lower() in COMMANDS or query.lower().startswith("connect "):
+        return query
+
+    lines = [query]
+    while len(lines) < QUERY_BATCH_MAX:
+        try:
+            line = await ainput("", timeout=QUERY_BATCH_WINDOW)
+        except EOFError:
+            # Input ended right after the paste; the next read reports it
+            break
+        if line is None:
+            break
+        if line:
+            lines.append(line)
+
+    if len(lines) == 1:
+        return query
+
+    numbered = "\n".join(f"{i}) {line}" for i, line in enumerate(lines, 1))
+    return f"Please answer each of these separately:\n{numbered}"
+
 
 async def select_server(client):
     """Interactive server selection if multiple servers are available"""
@@ -20,75 +133,92 @@ async def select_server(client):
         return server_name
 
     # Multiple servers, let the user choose
-    print("\nAvailable servers:")
+    lines = ["\nAvailable servers:"]
     for i, name in enumerate(servers):
-        print(f"{i + 1}. {name}")
+        lines.append(f"{i + 1}. {name}")
+    print("\n".join(lines))
 
     while True:
-        try:
-            choice = input("\nSelect a server (number or name): ").strip()
+        choice = await ainput("\nSelect a server (number or name): ")
 
-            # Try to interpret as a number
-            try:
-                idx = int(choice) - 1
-                if 0 <= idx < len(servers):
-                    return servers[idx]
-                else:
-                    print("❌ Invalid selection. Please choose a valid number.")
-            except ValueError:
-                # Not a number, try to match by name
-                if choice in servers:
-                    return choice
-                else:
-                    print(
-                        "❌ Server not found. Please enter a valid server name or number."
-                    )
-        except KeyboardInterrupt:
-            return None
+        # Try to interpret as a number
+        try:
+            idx = int(choice) - 1
+            if 0 <= idx < len(servers):
+                return servers[idx]
+            else:
+                print("❌ Invalid selection. Please choose a valid number.")
+        except ValueError:
+            # Not a number, try to match by name
+            if choice in servers:
+                return choice
+            else:
+                print("❌ Server not found. Please enter a valid server name or number.")
 
 
 async def chat_loop(client):
     """Run an interactive chat loop"""
-    print("\n🚀 MCP Client Started!")
-    print(f"🔗 Connected to server: {client.active_server_name}")
-    print("💬 Type your queries or 'quit' to exit.")
-    print("🔄 Type 'servers' to list available servers.")
-    print("🔌 Type 'connect <server_name>' to connect to a different server.")
-    print("🛠️ Type 'debug' to print diagnostic information.")
-    print("〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️")
+    # Build multi-line blocks and print each with a single write
+    print(
+        "\n".join(
+            [
+                "\n🚀 MCP Client Started!",
+                f"🔗 Connected to server: {client.active_server_name}",
+                "💬 Type your queries or 'quit' to exit.",
+                "🔄 Type 'servers' to list available servers.",
+                "🔌 Type 'connect <server_name>' to connect to a different server.",
+                "🛠️ Type 'debug' to print diagnostic information.",
+                "♻️ Type 'refresh-tools' to re-fetch the server's tool list.",
+                "〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️",
+            ]
+        )
+    )
 
     while True:
         try:
-            query = input("\n🔍 Query: ").strip()
+            query = await read_query()
 
             if query.lower() == "quit":
                 break
 
             if query.lower() == "servers":
                 servers = await client.get_available_servers()
-                print("\nAvailable servers:")
+                lines = ["\nAvailable servers:"]
                 for i, name in enumerate(servers):
                     active = " (ACTIVE)" if name == client.active_server_name else ""
-                    print(f"{i + 1}. {name}{active}")
+                    lines.append(f"{i + 1}. {name}{active}")
+                print("\n".join(lines))
                 continue
 
             if query.lower().startswith("connect "):
                 server_name = query[8:].strip()
                 print(f"\n⏳ Connecting to server '{server_name}'...")
-                await client.disconnect()
+                await client.disconnect(keep_alive=True)
                 await client.connect_to_server(server_name)
                 print(f"✅ Connected to server '{server_name}'")
                 continue
 
             if query.lower() == "debug":
                 # Print diagnostic information
-                print("\n📊 --- Diagnostic Information ---")
-                print(f"🔹 Server name: {client.active_server_name}")
-                print(f"🔹 Session active: {client.active_session is not None}")
+                lines = [
+                    "\n📊 --- Diagnostic Information ---",
+                    f"🔹 Server name: {client.active_server_name}",
+                    f"🔹 Session active: {client.active_session is not None}",
+                ]
                 if client.active_session:
                     tools = client.active_session.available_tools
-                    print(f"🔹 Available tools: {[tool.name for tool in tools]}")
-                print("〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️")
+                    lines.append(f"🔹 Available tools: {[tool.name for tool in tools]}")
+                lines.append("〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️")
+                print("\n".join(lines))
+                continue
+
+            if query.lower() == "refresh-tools":
+                # The debug output uses the cached tool list; this re-fetches it
+                if client.active_session:
+                    client.active_session.invalidate_tools()
+                    await client.active_session.refresh_tools()
+                    count = len(client.active_session.available_tools)
+                    print(f"✅ Tool list refreshed: {count} tools available")
                 continue
 
             print("\n⏳ Processing your query...")
@@ -97,14 +227,17 @@ async def chat_loop(client):
             print("\n〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️")
             print("🤖 Response:")
 
-            async for chunk in client.process_query_streaming(query):
-                print(chunk, end="", flush=True)
+            async for kind, payload in client.process_query_streaming(query):
+                if kind == "text":
+                    print(payload, end="", flush=True)
+                else:
+                    print(client.format_stream_event(kind, payload), end="", flush=True)
 
             print("\n〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️〰️")
 
         except Exception as e:
             print(f"\n❌ Error: {str(e)}")
-            traceback.print_exc()
+            logger.exception("Error processing query")
 
 
 async def main():
@@ -132,12 +265,15 @@ async def main():
         await chat_loop(client)
     except Exception as e:
         print(f"❌ Fatal error: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Fatal error")
     finally:
         print("🧹 Cleaning up resources...")
-        await client.disconnect()
+        await client.close()
         print("✓ Cleanup complete")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -1,33 +1,90 @@
-from typing import Dict, Any, List, Optional, AsyncGenerator
+from typing import Dict, Any, List, Optional, AsyncGenerator, Tuple
+import asyncio
+import contextlib
+import io
+import os
 import traceback
 
+import anyio
+
 from mcpclient.config import Config
 from mcpclient.session import MCPSession
 from mcpclient.connectors.stdio import StdioConnector
-from mcpclient.tools.extraction import ToolExtractor
+from mcpclient.tools.extraction import ToolExtractor, StreamingToolExtractor
 from mcpclient.tools.execution import ToolExecutor
-from mcpclient.llm.gpt4o import GptLLM
-from mcpclient.llm.gemini import GeminiLLM
+from mcpclient.tools.toon import TOON_INSTRUCTION
+from mcpclient.llm import create_llm
+from mcpclient.llm.cache import ResponseCache
+
+# Size of the pieces a cached response is replayed in when streaming
+CACHE_REPLAY_CHUNK_SIZE = 64
+
+# JSON-RPC error code the MCP SDK uses when the server connection is closed
+CONNECTION_CLOSED = -32000
+
+
+def _is_connection_lost(error: BaseException) -> bool:
+    """Check whether an error means the server connection was lost
+
+    Args:
+        error: Error raised by a tool call
+
+    Returns:
+        True if the server needs to be reconnected
+    """
+    if isinstance(
+        error, (ConnectionError, anyio.ClosedResourceError, anyio.BrokenResourceError)
+    ):
+        return True
+    return getattr(getattr(error, "error", None), "code", None) == CONNECTION_CLOSED
 
 
 class MCPClient:
     """Client for interacting with MCP servers"""
 
+    __slots__ = (
+        "config",
+        "active_session",
+        "active_server_name",
+        "llm",
+        "response_cache",
+        "max_parallel_tools",
+        "tool_timeout",
+        "stop_at_tool_call",
+        "_idle_sessions",
+        "_reconnect_lock",
+    )
+
     def __init__(
         self,
         config_path: Optional[str] = None,
         config_dict: Optional[Dict[str, Any]] = None,
+        config: Optional[Config] = None,
     ):
         """Initialize a new MCP client
 
         Args:
             config_path: Path to configuration file
             config_dict: Configuration dictionary
+            config: Already loaded configuration, used instead of the above
         """
-        self.config = Config(config_path, config_dict)
+        self.config = config if config is not None else Config(config_path, config_dict)
         self.active_session: Optional[MCPSession] = None
         self.active_server_name: Optional[str] = None
-        self.llm = GptLLM()
+        # Backend chosen by MCP_LLM ("gpt" or "gemini"), GPT by default
+        self.llm = create_llm(os.environ.get("MCP_LLM", "gpt"))
+        # Set to None to disable response caching
+        self.response_cache: Optional[ResponseCache] = ResponseCache()
+        # Maximum number of tool calls executed at once
+        self.max_parallel_tools = 8
+        # Seconds a single tool call may take, or None to wait indefinitely
+        self.tool_timeout: Optional[float] = 120
+        # Stop streaming a response once it contains a complete tool call,
+        # for workflows that make one tool call per turn
+        self.stop_at_tool_call = False
+        # Sessions kept running after disconnect(keep_alive=True), by server
+        self._idle_sessions: Dict[str, MCPSession] = {}
+        self._reconnect_lock = asyncio.Lock()
 
     async def connect_to_server(self, server_name: str) -> None:
         """Connect to a server
@@ -38,26 +95,27 @@ class MCPClient:
         Raises:
             ValueError: If server not found or connection fails
         """
-        try:
-            # Get server configuration
-            server_config = self.config.get_server_config(server_name)
-
-            # Extract command details
-            if "command" not in server_config:
-                raise ValueError(
-                    f"Server '{server_name}' does not have command configuration"
-                )
-
-            cmd_config = server_config["command"]
-            command_path = cmd_config.get("path")
-            args = cmd_config.get("args", [])
-            env = cmd_config.get("env", {})
+        # Reuse a session kept warm from an earlier connection
+        session = self._idle_sessions.pop(server_name, None)
+        if session is not None and session.connector.connected:
+            self.active_session = session
+            self.active_server_name = server_name
+            print(
+                f"✅ Reconnected to server '{server_name}' with {len(session.tools)} tools available"
+            )
+            return
+        if session is not None:
+            # The server stopped while idle; clean up and start it again
+            await session.disconnect()
 
-            # Normalize environment variables
-            environment = self.config.normalize_env_variables(env)
+        try:
+            # Get server launch details
+            spec = self.config.get_server_spec(server_name)
 
-            # Create connector
-            connector = StdioConnector(command=command_path, args=args, env=environment)
+            # Create connector; the spec's environment is already normalized
+            connector = StdioConnector(
+                command=spec.command_path, args=list(spec.args), env=dict(spec.env)
+            )
 
             # Create and initialize session
             self.active_session = MCPSession(connector)
@@ -65,6 +123,9 @@ class MCPClient:
             await self.active_session.initialize()
             self.active_server_name = server_name
 
+            # Build the tool prompt now rather than on the first query
+            self._get_tool_info()
+
             print(
                 f"✅ Connected to server '{server_name}' with {len(self.active_session.tools)} tools available"
             )
@@ -83,28 +144,346 @@ class MCPClient:
         Returns:
             Formatted tool information
         """
-        tool_info = "\n\nAvailable tools:\n"
+        parts = ["\n\nAvailable tools:\n"]
         for tool in tools:
-            tool_info += f"- {tool.name}: {tool.description}\n"
+            parts.append(f"- {tool.name}: {tool.description}\n")
             if hasattr(tool, "inputSchema") and tool.inputSchema:
                 if "properties" in tool.inputSchema:
-                    tool_info += "  Parameters:\n"
+                    parts.append("  Parameters:\n")
+                    required_set = set(tool.inputSchema.get("required", ()))
                     for param_name, param_details in tool.inputSchema[
                         "properties"
                     ].items():
-                        required = (
-                            "required" in tool.inputSchema
-                            and param_name in tool.inputSchema["required"]
+                        req_tag = " (required)" if param_name in required_set else ""
+                        parts.append(
+                            f"    - {param_name}{req_tag}: {param_details.get('description', '')}\n"
                         )
-                        req_tag = " (required)" if required else ""
-                        tool_info += f"    - {param_name}{req_tag}: {param_details.get('description', '')}\n"
 
         # Add instructions for how to call tools
-        tool_info += "\nTo call a tool, use this format in your response:\n"
-        tool_info += "TOOL: tool_name\n"
-        tool_info += 'PARAMETERS: {"param1": "value1", "param2": "value2"}\n'
+        parts.append("\nTo call a tool, use this format in your response:\n")
+        parts.append("TOOL: tool_name\n")
+        parts.append('PARAMETERS: {"param1": "value1", "param2": "value2"}\n')
+        parts.append(TOON_INSTRUCTION)
+
+        return "".join(parts)
+
+    def _get_tool_info(self) -> str:
+        """Get formatted tool information for the active session
+
+        The tool list is fixed for a connected session, so the formatted
+        string is built once and cached on the session.
+
+        Returns:
+            Formatted tool information
+        """
+        session = self.active_session
+        if session._tool_info_cache is None:
+            session._tool_info_cache = self._format_tool_info(session.available_tools)
+        return session._tool_info_cache
+
+    def _response_cache_key(
+        self, messages: List[Dict[str, Any]], tool_info: Optional[str]
+    ) -> str:
+        """Build the response cache key for an LLM call
+
+        Args:
+            messages: Messages for context
+            tool_info: Information about available tools
+
+        Returns:
+            Cache key
+        """
+        return ResponseCache.make_key(self._response_cache_scope(tool_info), messages)
+
+    def _response_cache_scope(self, tool_info: Optional[str]) -> str:
+        """Build the key of everything besides the messages that shapes a response
+
+        Args:
+            tool_info: Information about available tools
+
+        Returns:
+            Cache scope
+        """
+        return ResponseCache.make_key(
+            self.active_server_name,
+            type(self.llm).__name__,
+            getattr(self.llm, "model_name", None),
+            tool_info,
+        )
+
+    async def _semantic_vector(
+        self, messages: List[Dict[str, Any]]
+    ) -> Optional[List[float]]:
+        """Embed the query to match in the semantic cache tier
+
+        Only the opening query of a conversation is matched semantically;
+        later calls carry tool results, which must match exactly.
+
+        Args:
+            messages: Messages for context
+
+        Returns:
+            Query embedding, or None if the call should only match exactly
+        """
+        if self.response_cache.encoder is None or len(messages) != 1:
+            return None
+        return await self.response_cache.encode(messages[0]["content"])
+
+    def _semantic_reusable(self, response: str) -> bool:
+        """Check whether a response may be reused for similar queries
+
+        Tool calls carry arguments taken from the exact query, so a
+        response making them is only reused for that query.
+
+        Args:
+            response: Generated text
+
+        Returns:
+            True if the response makes no tool calls
+        """
+        tools_by_name = None
+        if self.active_session is not None:
+            tools_by_name = self.active_session.tools_by_name
+        return not ToolExtractor.extract_tool_calls(response, tools_by_name)
+
+    async def _generate(
+        self, messages: List[Dict[str, Any]], tool_info: Optional[str] = None
+    ) -> str:
+        """Generate an LLM response, reusing a cached one for identical input
+
+        Args:
+            messages: Messages for context
+            tool_info: Information about available tools
+
+        Returns:
+            Generated text
+        """
+        if self.response_cache is None:
+            return await self.llm.generate(messages, tool_info)
+
+        key = self._response_cache_key(messages, tool_info)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        scope = self._response_cache_scope(tool_info)
+        vector = await self._semantic_vector(messages)
+        if vector is not None:
+            cached = self.response_cache.get_similar(scope, vector)
+            if cached is not None:
+                return cached
+
+        response = await self.llm.generate(messages, tool_info)
+        if vector is not None and not self._semantic_reusable(response):
+            vector = None
+        self.response_cache.set(key, response, scope, vector)
+        return response
+
+    async def _generate_streaming(
+        self, messages: List[Dict[str, Any]], tool_info: Optional[str] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream an LLM response, replaying a cached one for identical input
+
+        Args:
+            messages: Messages for context
+            tool_info: Information about available tools
+
+        Yields:
+            Generated text chunks
+        """
+        if self.response_cache is None:
+            async for chunk in self.llm.generate_streaming(messages, tool_info):
+                yield chunk
+            return
+
+        # Key on the history as it is now; the caller appends to it later
+        key = self._response_cache_key(messages, tool_info)
+        cached = self.response_cache.get(key)
+        scope = self._response_cache_scope(tool_info)
+        vector = None
+        if cached is None:
+            vector = await self._semantic_vector(messages)
+        if vector is not None:
+            cached = self.response_cache.get_similar(scope, vector)
+        if cached is not None:
+            for i in range(0, len(cached), CACHE_REPLAY_CHUNK_SIZE):
+                yield cached[i : i + CACHE_REPLAY_CHUNK_SIZE]
+            return
+
+        chunks = []
+        async for chunk in self.llm.generate_streaming(messages, tool_info):
+            chunks.append(chunk)
+            yield chunk
+
+        response = "".join(chunks)
+        if vector is not None and not self._semantic_reusable(response):
+            vector = None
+        self.response_cache.set(key, response, scope, vector)
+
+    async def _call_tool_limited(
+        self, semaphore: asyncio.Semaphore, tool_name: str, tool_args: Dict[str, Any]
+    ) -> Any:
+        """Call a tool once a concurrency slot is free
+
+        Args:
+            semaphore: Semaphore bounding concurrent tool calls
+            tool_name: Name of the tool to call
+            tool_args: Arguments for the tool
+
+        Returns:
+            Tool result
+
+        Raises:
+            TimeoutError: If the call takes longer than tool_timeout
+        """
+        async with semaphore:
+            session = self.active_session
+            try:
+                return await self._call_tool_timed(session, tool_name, tool_args)
+            except Exception as e:
+                if not _is_connection_lost(e):
+                    raise
+                print(f"⚠️ Lost connection to server while calling '{tool_name}': {e}")
+
+            # Restart the server once and retry the call
+            await self._reconnect(session)
+            if self.active_session is None:
+                raise RuntimeError(f"Could not reconnect to call '{tool_name}'")
+            return await self._call_tool_timed(
+                self.active_session, tool_name, tool_args
+            )
+
+    async def _call_tool_timed(
+        self, session: MCPSession, tool_name: str, tool_args: Dict[str, Any]
+    ) -> Any:
+        """Call a tool, giving up after tool_timeout
+
+        Args:
+            session: Session to call the tool on
+            tool_name: Name of the tool to call
+            tool_args: Arguments for the tool
+
+        Returns:
+            Tool result
+
+        Raises:
+            TimeoutError: If the call takes longer than tool_timeout
+        """
+        try:
+            return await asyncio.wait_for(
+                session.call_tool(tool_name, tool_args), self.tool_timeout
+            )
+        except asyncio.TimeoutError:
+            # Only this call is abandoned; the session stays usable
+            raise TimeoutError(
+                f"Tool '{tool_name}' timed out after {self.tool_timeout} seconds"
+            ) from None
+
+    async def _reconnect(self, session: MCPSession) -> None:
+        """Replace a session whose server connection was lost
+
+        Concurrent callers that lost the same session share one reconnect.
+
+        Args:
+            session: The session that lost its connection
+        """
+        async with self._reconnect_lock:
+            if self.active_session is not session:
+                # Another call already reconnected
+                return
+
+            server_name = self.active_server_name
+            try:
+                await session.disconnect()
+            except Exception:
+                pass
+            self.active_session = None
+            await self.connect_to_server(server_name)
+
+    def _start_tool_call(
+        self,
+        semaphore: asyncio.Semaphore,
+        started: List[Tuple[asyncio.Task, bool]],
+        tool_name: str,
+        tool_args: Dict[str, Any],
+    ) -> asyncio.Task:
+        """Start a tool call as a task, keeping stateful tools exclusive
+
+        A call to a tool whose schema sets "x-stateful" waits for every call
+        started before it, and calls started after it wait for it to finish.
+        Other calls run concurrently, bounded by the semaphore.
+
+        Args:
+            semaphore: Semaphore bounding concurrent tool calls
+            started: (task, stateful) for each call already started in this
+                query; the new call is appended
+            tool_name: Name of the tool to call
+            tool_args: Arguments for the tool
+
+        Returns:
+            Task resolving to the tool result
+        """
+        tool = self.active_session.tools_by_name.get(tool_name)
+        stateful = ToolExecutor.is_stateful(tool)
+        if stateful:
+            before = [task for task, _ in started]
+        else:
+            # The last stateful call already waits for everything before it
+            before = next(
+                ([task] for task, is_stateful in reversed(started) if is_stateful), []
+            )
+
+        task = asyncio.create_task(
+            self._call_tool_after(before, semaphore, tool_name, tool_args)
+        )
+        started.append((task, stateful))
+        return task
+
+    async def _call_tool_after(
+        self,
+        before: List[asyncio.Task],
+        semaphore: asyncio.Semaphore,
+        tool_name: str,
+        tool_args: Dict[str, Any],
+    ) -> Any:
+        """Call a tool once the calls it must follow have finished
 
-        return tool_info
+        Args:
+            before: Tasks that must finish first
+            semaphore: Semaphore bounding concurrent tool calls
+            tool_name: Name of the tool to call
+            tool_args: Arguments for the tool
+
+        Returns:
+            Tool result
+        """
+        if before:
+            # asyncio.wait, unlike gather, leaves the other calls running if
+            # this one is cancelled
+            await asyncio.wait(before)
+        return await self._call_tool_limited(semaphore, tool_name, tool_args)
+
+    async def _call_tools(
+        self, tool_calls: List[Tuple[str, Dict[str, Any]]]
+    ) -> List[Any]:
+        """Execute independent tool calls concurrently
+
+        Args:
+            tool_calls: List of (tool_name, parameters) tuples
+
+        Returns:
+            Results in the same order as tool_calls; a failed call's entry is
+            the exception it raised
+        """
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        started: List[Tuple[asyncio.Task, bool]] = []
+        return await asyncio.gather(
+            *(
+                self._start_tool_call(semaphore, started, tool_name, tool_args)
+                for tool_name, tool_args in tool_calls
+            ),
+            return_exceptions=True,
+        )
 
     async def process_query(self, query: str) -> str:
         """Process a query using the LLM and available tools
@@ -124,52 +503,68 @@ class MCPClient:
         # Create initial messages
         messages = [{"role": "user", "content": query}]
 
+        # Pick up tool list changes announced by the server
+        await self.active_session.refresh_tools()
+
         # Get tool information
-        tools = self.active_session.available_tools
-        tool_info = self._format_tool_info(tools)
+        tools_by_name = self.active_session.tools_by_name
+        tool_info = self._get_tool_info()
 
         # Get initial response
-        response_text = await self.llm.generate(messages, tool_info)
+        response_text = await self._generate(messages, tool_info)
 
         # Extract tool calls
-        tool_calls = ToolExtractor.extract_tool_calls(response_text, tools)
+        tool_calls = ToolExtractor.extract_tool_calls(response_text, tools_by_name)
+
+        # Build final response in a buffer so large tool outputs are written
+        # once rather than kept as separate list items until the end
+        final_text = io.StringIO()
+        final_text.write(response_text)
+
+        # Keep the model response in the history for the follow-up
+        messages.append({"role": "model", "content": response_text})
 
-        # Build final response
-        final_text = [response_text]
+        # Execute all tool calls concurrently; results keep the call order
+        results = await self._call_tools(tool_calls)
 
         # Process tool calls
-        for tool_name, tool_args in tool_calls:
+        for (tool_name, tool_args), result in zip(tool_calls, results):
             # Format and add tool call to response
             formatted_args = str(tool_args)
             tool_call_display = (
-                f"\n🔧 Using tool: {tool_name}\n📝 Parameters: {formatted_args}"
+                f"\n\n🔧 Using tool: {tool_name}\n📝 Parameters: {formatted_args}"
             )
-            final_text.append(tool_call_display)
-
-            try:
-                # Execute tool
-                result = await self.active_session.call_tool(tool_name, tool_args)
-
-                # Format the result
-                tool_result = str(result.content)
-                result_display = f"\n📊 Result:\n{tool_result}"
-                final_text.append(result_display)
-
-                # Get follow-up response
-                follow_up_messages = messages.copy()
-                follow_up_messages.append({"role": "model", "content": response_text})
-                follow_up_messages.append({"role": "user", "content": result_display})
-
-                follow_up = await self.llm.generate(follow_up_messages)
-                final_text.append("\n" + follow_up)
-
-            except Exception as e:
-                error_msg = f"\n❌ Error calling tool {tool_name}: {str(e)}"
-                final_text.append(error_msg)
-
-        return "\n".join(final_text)
-
-    async def process_query_streaming(self, query: str) -> AsyncGenerator[str, None]:
+            final_text.write(tool_call_display)
+
+            if isinstance(result, BaseException):
+                error_msg = f"\n\n❌ Error calling tool {tool_name}: {str(result)}"
+                final_text.write(error_msg)
+
+                # Let the model see the failure, as the streaming path does
+                error_content = f"TOOL ERROR: {tool_name}\n{str(result)}"
+                messages.append({"role": "user", "content": error_content})
+                continue
+
+            # Format the result, and add it to the history in compact form
+            tool_result = ToolExecutor.format_tool_result(result)
+            result_display = f"\n📊 Result:\n{tool_result}"
+            final_text.write("\n")
+            final_text.write(result_display)
+            llm_result = ToolExecutor.format_tool_result(result, compact=True)
+            result_content = f"TOOL RESULT: {tool_name}\n{llm_result}"
+            messages.append({"role": "user", "content": result_content})
+
+        # Get a single follow-up response covering every tool result or error
+        if tool_calls:
+            follow_up = await self._generate(messages, tool_info)
+            final_text.write("\n\n")
+            final_text.write(follow_up)
+
+        return final_text.getvalue()
+
+    async def process_query_streaming(
+        self, query: str
+    ) -> AsyncGenerator[Tuple[str, Any], None]:
         """Process a query with streaming response.
 
         Simple flow:
@@ -183,18 +578,26 @@ class MCPClient:
             query: User query
 
         Yields:
-            Response chunks
+            Events as (kind, payload) tuples, where kind is one of "text",
+            "tool_start", "tool_result", "tool_error" or "error"
         """
         if not self.active_session:
             raise RuntimeError("No active session. Connect to a server first.")
 
-        # Get available tools
-        tools = self.active_session.available_tools
-        tool_info = self._format_tool_info(tools)
+        # Get available tools, picking up changes announced by the server
+        await self.active_session.refresh_tools()
+        tools_by_name = self.active_session.tools_by_name
+        tool_info = self._get_tool_info()
 
-        # Start with user message
+        # Start with user message. The history is only ever appended to and
+        # tool_info is sent on every turn, so each call shares the previous
+        # call's prompt prefix and can hit the provider's prompt cache.
         messages = [{"role": "user", "content": query}]
 
+        # Bounds the tool calls running at once across the whole query
+        semaphore = asyncio.Semaphore(self.max_parallel_tools)
+        started: List[Tuple[asyncio.Task, bool]] = []
+
         # Maximum number of turns to prevent infinite loops
         max_turns = 10
         turn_count = 0
@@ -203,51 +606,93 @@ class MCPClient:
             turn_count += 1
 
             # --- Get LLM Response ---
-            llm_response = ""
+            response_chunks = []
+            # Tool calls are started as soon as their parameters are complete,
+            # so they run while the rest of the response is still streaming
+            extractor = StreamingToolExtractor()
+            tool_calls: List[Tuple[str, Dict[str, Any], Optional[asyncio.Task]]] = []
             try:
                 # Separate turns with visual indicator if not the first turn
                 if turn_count > 1:
-                    yield "\n\n"
-
-                # Stream LLM response
-                async for chunk in self.llm.generate_streaming(messages, tool_info if turn_count == 1 else None):
-                    llm_response += chunk
-                    yield chunk
+                    yield "text", "\n\n"
+
+                # Stream LLM response; closing the stream on an early stop
+                # ends the provider request rather than leaving it running
+                async with contextlib.aclosing(
+                    self._generate_streaming(messages, tool_info)
+                ) as stream:
+                    async for chunk in stream:
+                        response_chunks.append(chunk)
+                        yield "text", chunk
+
+                        for tool_name, tool_args in extractor.feed(chunk):
+                            task = self._start_tool_call(
+                                semaphore, started, tool_name, tool_args
+                            )
+                            tool_calls.append((tool_name, tool_args, task))
+
+                        if tool_calls and self.stop_at_tool_call:
+                            break
 
             except Exception as e:
-                yield f"\n\n❌ Error: {str(e)}\n"
+                # Abandon any tools already started for this response
+                tasks = [task for _, _, task in tool_calls if task is not None]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+                yield "error", f"Error: {str(e)}"
                 break
 
             # Add LLM response to conversation history
+            llm_response = "".join(response_chunks)
             messages.append({"role": "model", "content": llm_response})
 
             # --- Extract Tool Calls ---
-            tool_calls = ToolExtractor.extract_tool_calls(llm_response, tools)
+            for tool_name, tool_args in extractor.finish():
+                tool_calls.append((tool_name, tool_args, None))
+
+            # Fall back to matching tool mentions in the full response
+            if not tool_calls:
+                for tool_name, tool_args in ToolExtractor.extract_tool_calls(
+                    llm_response, tools_by_name
+                ):
+                    tool_calls.append((tool_name, tool_args, None))
 
             # If no tool calls, we're done
             if not tool_calls:
                 break
 
             # --- Execute Tools ---
-            for tool_name, tool_args in tool_calls:
-                # Format tool call for output
-                yield f"\n\n🔧 Using tool: {tool_name}\n📝 Parameters: {str(tool_args)}"
+            # Start the remaining calls so they all run concurrently
+            tool_calls = [
+                (
+                    tool_name,
+                    tool_args,
+                    task
+                    or self._start_tool_call(semaphore, started, tool_name, tool_args),
+                )
+                for tool_name, tool_args, task in tool_calls
+            ]
+
+            # Report results in call order
+            for tool_name, tool_args, task in tool_calls:
+                yield "tool_start", {"name": tool_name, "args": tool_args}
 
                 try:
-                    # Execute the tool
-                    result = await self.active_session.call_tool(tool_name, tool_args)
+                    result = await task
 
                     # Format and show result
                     result_text = ToolExecutor.format_tool_result(result)
-                    yield f"\n📊 Result:\n{result_text}"
+                    yield "tool_result", result_text
 
                     # Add tool result to conversation history as a user message
-                    result_content = f"TOOL RESULT: {tool_name}\n{result_text}"
+                    llm_result = ToolExecutor.format_tool_result(result, compact=True)
+                    result_content = f"TOOL RESULT: {tool_name}\n{llm_result}"
                     messages.append({"role": "user", "content": result_content})
 
                 except Exception as e:
-                    error_msg = f"\n❌ Error: {str(e)}"
-                    yield error_msg
+                    yield "tool_error", str(e)
 
                     # Add error to conversation history
                     error_content = f"TOOL ERROR: {tool_name}\n{str(e)}"
@@ -255,7 +700,30 @@ class MCPClient:
 
         # If we hit the max turn limit
         if turn_count >= max_turns:
-            yield f"\n\n❌ Reached maximum number of turns ({max_turns})."
+            yield "error", f"Reached maximum number of turns ({max_turns})."
+
+    @staticmethod
+    def format_stream_event(kind: str, payload: Any) -> str:
+        """Format a streaming event for display
+
+        Args:
+            kind: Event kind yielded by process_query_streaming
+            payload: Event payload
+
+        Returns:
+            Display text for the event
+        """
+        if kind == "text":
+            return payload
+        if kind == "tool_start":
+            return f"\n\n🔧 Using tool: {payload['name']}\n📝 Parameters: {str(payload['args'])}"
+        if kind == "tool_result":
+            return f"\n📊 Result:\n{payload}"
+        if kind == "tool_error":
+            return f"\n❌ Error: {payload}"
+        if kind == "error":
+            return f"\n\n❌ {payload}\n"
+        return str(payload)
 
     async def get_available_servers(self) -> List[str]:
         """Get list of available servers
@@ -265,9 +733,26 @@ class MCPClient:
         """
         return self.config.get_server_names()
 
-    async def disconnect(self) -> None:
-        """Disconnect from the active server"""
+    async def disconnect(self, keep_alive: bool = False) -> None:
+        """Disconnect from the active server
+
+        Args:
+            keep_alive: Keep the server running so a later connect_to_server
+                call for it skips the process start and handshake
+        """
         if self.active_session:
-            await self.active_session.disconnect()
+            if keep_alive:
+                self._idle_sessions[self.active_server_name] = self.active_session
+            else:
+                await self.active_session.disconnect()
             self.active_session = None
             self.active_server_name = None
+
+    async def close(self) -> None:
+        """Disconnect from all servers and release the LLM's resources"""
+        await self.disconnect()
+        sessions = list(self._idle_sessions.values())
+        self._idle_sessions.clear()
+        for session in sessions:
+            await session.disconnect()
+        await self.llm.aclose()
@@ -1,6 +1,64 @@
-import json
+import asyncio
+import functools
 import os
-from typing import Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+from mcpclient import jsonutil
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Read and parse a config file
+
+    Cached per path and modification time, so an edited file is re-read.
+
+    Args:
+        path: Absolute path to the configuration file
+        mtime_ns: Modification time of the file, part of the cache key
+
+    Returns:
+        Parsed configuration
+    """
+    with open(path, "rb") as f:
+        return jsonutil.loads(f.read())
+
+
+def _needs_normpath(value: str) -> bool:
+    """Check whether os.path.normpath would change a path
+
+    Most configured paths are already clean, so normpath is skipped for
+    them. Values mixing in the alternate separator (``/`` on Windows) are
+    also caught, which checking for os.sep alone missed.
+
+    Args:
+        value: Environment variable value
+
+    Returns:
+        True if the value has separators to normalize
+    """
+    sep = os.path.sep
+    altsep = os.path.altsep
+    if altsep and altsep in value:
+        return True
+    if sep not in value:
+        return False
+    return (
+        sep + sep in value
+        or sep + "." in value
+        or value.startswith(".")
+        or (value.endswith(sep) and len(value) > 1)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ServerSpec:
+    """Launch details for a configured server"""
+
+    command_path: str
+    args: Tuple[str, ...]
+    # Normalized environment variables for the server
+    env: Tuple[Tuple[str, str], ...]
 
 
 class Config:
@@ -18,6 +76,7 @@ class Config:
             config_dict: Dictionary containing configuration
         """
         self.config: Dict[str, Any] = {}
+        self._server_specs: Dict[str, ServerSpec] = {}
 
         if config_dict:
             self.config = config_dict
@@ -34,10 +93,25 @@ class Config:
             ValueError: If file cannot be read or parsed
         """
         try:
-            with open(path, "r") as f:
-                self.config = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError) as e:
+            path = os.path.abspath(path)
+            self.config = _load_config_file(path, os.stat(path).st_mtime_ns)
+        except (FileNotFoundError, jsonutil.JSONDecodeError) as e:
             raise ValueError(f"Error loading config file: {str(e)}")
+        self._server_specs = {}
+
+    async def load_from_file_async(self, path: str) -> None:
+        """Load configuration from file without blocking the event loop
+
+        The file is read and parsed in a worker thread, so other coroutines
+        keep running if the file lives on a slow filesystem.
+
+        Args:
+            path: Path to the configuration file
+
+        Raises:
+            ValueError: If file cannot be read or parsed
+        """
+        await asyncio.to_thread(self.load_from_file, path)
 
     def get_server_config(self, server_name: str) -> Dict[str, Any]:
         """Get configuration for a specific server
@@ -59,6 +133,40 @@ class Config:
 
         return self.config["context_servers"][server_name]
 
+    def get_server_spec(self, server_name: str) -> ServerSpec:
+        """Get the launch details for a specific server
+
+        Built once per server, with its environment variables already
+        normalized, and reused on every later connect.
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            Server launch details
+
+        Raises:
+            ValueError: If server not found or has no command configuration
+        """
+        spec = self._server_specs.get(server_name)
+        if spec is not None:
+            return spec
+
+        server_config = self.get_server_config(server_name)
+        if "command" not in server_config:
+            raise ValueError(
+                f"Server '{server_name}' does not have command configuration"
+            )
+
+        cmd_config = server_config["command"]
+        spec = ServerSpec(
+            command_path=cmd_config.get("path"),
+            args=tuple(cmd_config.get("args", [])),
+            env=tuple(self.normalize_env_variables(cmd_config.get("env")).items()),
+        )
+        self._server_specs[server_name] = spec
+        return spec
+
     def get_server_names(self) -> list[str]:
         """Get list of all server names in config
 
@@ -77,19 +185,19 @@ class Config:
             env: Environment variables dictionary
 
         Returns:
-            Normalized environment variables
+            Normalized environment variables, to be applied on top of the
+            process environment by the connector
         """
-        # Convert env dict to proper environment variables
-        environment = os.environ.copy()
-        if env:
-            # Make sure all paths use correct format for the platform
-            normalized_env = {}
-            for key, value in env.items():
-                if isinstance(value, str) and os.path.sep in value:
-                    normalized_env[key] = os.path.normpath(value)
-                else:
-                    normalized_env[key] = str(value)
-
-            environment.update(normalized_env)
-
-        return environment
+        if not env:
+            return {}
+
+        # Make sure all paths use correct format for the platform; values
+        # from JSON that are not strings cannot contain a separator
+        return {
+            key: (
+                os.path.normpath(value)
+                if type(value) is str and _needs_normpath(value)
+                else str(value)
+            )
+            for key, value in env.items()
+        }
@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, TypedDict, Union
 from mcp import ClientSession
-from mcp.types import Tool, InitializeResult
+from mcp.types import Tool, InitializeResult, ToolListChangedNotification
 
 
 # Define a TypedDict for the initialize result if needed
@@ -18,6 +18,7 @@ class BaseConnector(ABC):
         self.session: Optional[ClientSession] = None
         self._tools: List[Tool] = []
         self._connected = False
+        self._tools_changed = False
 
     @property
     def tools(self) -> List[Tool]:
@@ -33,6 +34,38 @@ class BaseConnector(ABC):
             raise RuntimeError("Connector is not connected")
         return self._tools
 
+    @property
+    def connected(self) -> bool:
+        """Whether the connector is connected
+
+        Returns:
+            True if connected
+        """
+        return self._connected
+
+    @property
+    def tools_changed(self) -> bool:
+        """Whether the server reported a change to its tool list
+
+        Returns:
+            True if the tool list should be re-fetched
+        """
+        return self._tools_changed
+
+    def invalidate_tools(self) -> None:
+        """Mark the tool list as stale so it is re-fetched on next use"""
+        self._tools_changed = True
+
+    async def _handle_message(self, message: Any) -> None:
+        """Handle a message sent by the server
+
+        Args:
+            message: Server notification, request or transport error
+        """
+        notification = getattr(message, "root", message)
+        if isinstance(notification, ToolListChangedNotification):
+            self.invalidate_tools()
+
     @abstractmethod
     async def connect(self) -> ClientSession:
         """Connect to MCP implementation
@@ -63,10 +96,39 @@ class BaseConnector(ABC):
         result = await self.session.initialize()
 
         # Get available tools
+        await self.list_tools()
+
+        return result
+
+    async def list_tools(self) -> List[Tool]:
+        """Fetch the list of available tools from the server
+
+        Returns:
+            List of tools
+
+        Raises:
+            RuntimeError: If not connected
+        """
+        if not self.session:
+            raise RuntimeError("Not connected to MCP implementation")
+
+        self._tools_changed = False
         tools_result = await self.session.list_tools()
         self._tools = tools_result.tools
+        return self._tools
 
-        return result
+    async def ping(self) -> None:
+        """Check that the server is responsive
+
+        Cheaper than re-listing tools to validate a session.
+
+        Raises:
+            RuntimeError: If not connected
+        """
+        if not self.session:
+            raise RuntimeError("Not connected to MCP implementation")
+
+        await self.session.send_ping()
 
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """Call an MCP tool
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import os
 from typing import Dict, Any, Optional
 from contextlib import AsyncExitStack
@@ -8,6 +10,20 @@ from mcp.client.stdio import stdio_client
 from .base import BaseConnector
 
 
+@functools.lru_cache(maxsize=1)
+def _base_environment() -> Dict[str, str]:
+    """Snapshot the process environment
+
+    Taken on the first connect, after .env files have been loaded, and
+    shared by every later connect. Copying os.environ decodes every entry,
+    so it is done only once.
+
+    Returns:
+        Process environment variables
+    """
+    return dict(os.environ)
+
+
 class StdioConnector(BaseConnector):
     """Connector for MCP implementations using stdio transport"""
 
@@ -25,13 +41,60 @@ class StdioConnector(BaseConnector):
         self.command = command
         self.args = args
         self.env = env or {}
-        self.exit_stack = AsyncExitStack()
         self.stdio = None
         self.write = None
+        self._task: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+
+    @property
+    def connected(self) -> bool:
+        """Whether the connector is connected and the server is still running
+
+        Returns:
+            True if connected
+        """
+        return self._connected and self._task is not None and not self._task.done()
+
+    async def _run(
+        self, server_params: StdioServerParameters, ready: asyncio.Future
+    ) -> None:
+        """Open the transport and session, and hold them open until stopped
+
+        The stdio transport uses cancel scopes that must be closed by the
+        task that opened them, in reverse order. Owning them in a dedicated
+        task lets the connector be disconnected from any task, in any order
+        relative to other connectors.
+
+        Args:
+            server_params: Server launch parameters
+            ready: Future resolved with the session, or the connection error
+        """
+        try:
+            async with AsyncExitStack() as exit_stack:
+                self.stdio, self.write = await exit_stack.enter_async_context(
+                    stdio_client(server_params)
+                )
+                session = await exit_stack.enter_async_context(
+                    ClientSession(
+                        self.stdio, self.write, message_handler=self._handle_message
+                    )
+                )
+                ready.set_result(session)
+                await self._stop.wait()
+        except BaseException as e:
+            if ready.done():
+                raise
+            ready.set_exception(e)
+        finally:
+            self.stdio = None
+            self.write = None
 
     async def connect(self) -> ClientSession:
         """Connect to MCP implementation
 
+        Idempotent: if already connected, the existing session is returned
+        and no new server process is started.
+
         Returns:
             Initialized MCP client session
         """
@@ -41,22 +104,24 @@ class StdioConnector(BaseConnector):
             return self.session
 
         # Prepare environment variables
-        environment = os.environ.copy()
-        environment.update(self.env)
+        environment = {**_base_environment(), **self.env}
 
         # Create server parameters
         server_params = StdioServerParameters(
             command=self.command, args=self.args, env=environment
         )
 
-        # Connect to the server
-        stdio_transport = await self.exit_stack.enter_async_context(
-            stdio_client(server_params)
-        )
-        self.stdio, self.write = stdio_transport
-        self.session = await self.exit_stack.enter_async_context(
-            ClientSession(self.stdio, self.write)
-        )
+        # Connect to the server; a failed attempt closes itself
+        ready = asyncio.get_running_loop().create_future()
+        self._stop = asyncio.Event()
+        self._task = asyncio.create_task(self._run(server_params, ready))
+        try:
+            self.session = await ready
+        except BaseException:
+            self._stop.set()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            raise
 
         self._connected = True
         return self.session
@@ -66,8 +131,8 @@ class StdioConnector(BaseConnector):
         if not self._connected:
             return
 
-        await self.exit_stack.aclose()
+        self._stop.set()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
         self.session = None
-        self.stdio = None
-        self.write = None
         self._connected = False
@@ -0,0 +1,101 @@
+import sqlite3
+from contextlib import closing
+from typing import Dict, List
+
+
+class SQLiteHistory:
+    """SQLite-backed store for chat history"""
+
+    def __init__(self, path: str):
+        """Initialize the history store
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id TEXT NOT NULL,
+                    role TEXT NOT NULL,
+                    content TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_session "
+                "ON messages (session_id, id)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection to the database
+
+        A connection is opened per operation so the store can be shared
+        between threads.
+        """
+        return sqlite3.connect(self.path)
+
+    def append(self, session_id: str, role: str, content: str) -> int:
+        """Append a message to a session's history
+
+        Args:
+            session_id: Session identifier
+            role: Message role
+            content: Message content
+
+        Returns:
+            Row id of the stored message; ids only ever increase
+        """
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "INSERT INTO messages (session_id, role, content) VALUES (?, ?, ?)",
+                (session_id, role, content),
+            )
+            return cursor.lastrowid or 0
+
+    def load(self, session_id: str) -> List[Dict[str, str]]:
+        """Load a session's history
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            List of messages in insertion order
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT role, content FROM messages WHERE session_id = ? ORDER BY id",
+                (session_id,),
+            ).fetchall()
+        return [{"role": role, "content": content} for role, content in rows]
+
+    def clear(self, session_id: str) -> None:
+        """Delete a session's history
+
+        Args:
+            session_id: Session identifier
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+
+    def prune(self, keep_sessions: int) -> None:
+        """Delete all but the most recently active sessions
+
+        Args:
+            keep_sessions: Number of sessions to keep, by their latest message
+        """
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """
+                DELETE FROM messages WHERE session_id NOT IN (
+                    SELECT session_id FROM messages
+                    GROUP BY session_id
+                    ORDER BY MAX(id) DESC
+                    LIMIT ?
+                )
+                """,
+                (keep_sessions,),
+            )
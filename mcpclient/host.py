@@ -0,0 +1,143 @@
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
+
+from mcp.types import Tool
+
+from mcpclient.config import Config
+from mcpclient.session import MCPSession
+from mcpclient.connectors.stdio import StdioConnector
+
+
+class MCPHost:
+    """Host holding sessions to several MCP servers at once"""
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        config_dict: Optional[Dict[str, Any]] = None,
+        config: Optional[Config] = None,
+    ):
+        """Initialize a new MCP host
+
+        Args:
+            config_path: Path to configuration file
+            config_dict: Configuration dictionary
+            config: Already loaded configuration, used instead of the above
+        """
+        self.config = config if config is not None else Config(config_path, config_dict)
+        self.sessions: Dict[str, MCPSession] = {}
+        # Maps each tool name to the server providing it and the tool itself
+        self.tool_registry: Dict[str, Tuple[str, Tool]] = {}
+
+    def _create_session(self, server_name: str) -> MCPSession:
+        """Create an unconnected session for a configured server
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            New session
+        """
+        spec = self.config.get_server_spec(server_name)
+        connector = StdioConnector(
+            command=spec.command_path, args=list(spec.args), env=dict(spec.env)
+        )
+        return MCPSession(connector)
+
+    async def _connect_one(self, server_name: str) -> MCPSession:
+        """Connect to a single server
+
+        Args:
+            server_name: Name of the server
+
+        Returns:
+            Connected and initialized session
+        """
+        session = self._create_session(server_name)
+        try:
+            await session.connect()
+            await session.initialize()
+        except Exception:
+            await session.disconnect()
+            raise
+        return session
+
+    async def connect_all(self, server_names: Optional[List[str]] = None) -> None:
+        """Connect to several servers concurrently
+
+        Servers start up in parallel, so connecting takes as long as the
+        slowest server rather than the sum of all of them. A server that
+        fails to connect is reported and skipped.
+
+        Args:
+            server_names: Servers to connect to; defaults to all configured
+                servers
+
+        Raises:
+            RuntimeError: If already connected
+        """
+        if self.sessions:
+            raise RuntimeError("Already connected. Disconnect first.")
+
+        if server_names is None:
+            server_names = self.config.get_server_names()
+
+        results = await asyncio.gather(
+            *(self._connect_one(server_name) for server_name in server_names),
+            return_exceptions=True,
+        )
+
+        for server_name, result in zip(server_names, results):
+            if isinstance(result, BaseException):
+                print(f"❌ Error connecting to server '{server_name}': {str(result)}")
+                continue
+
+            self.sessions[server_name] = result
+            for tool in result.available_tools:
+                if tool.name in self.tool_registry:
+                    owner = self.tool_registry[tool.name][0]
+                    print(
+                        f"⚠️ Tool '{tool.name}' from '{server_name}' is shadowed by '{owner}'"
+                    )
+                    continue
+                self.tool_registry[tool.name] = (server_name, tool)
+
+            print(
+                f"✅ Connected to server '{server_name}' with {len(result.available_tools)} tools available"
+            )
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool on whichever server provides it
+
+        Args:
+            name: Tool name
+            arguments: Tool arguments
+
+        Returns:
+            Tool result
+
+        Raises:
+            ValueError: If no connected server provides the tool
+        """
+        entry = self.tool_registry.get(name)
+        if entry is None:
+            raise ValueError(f"Tool '{name}' not found on any connected server")
+        return await self.sessions[entry[0]].call_tool(name, arguments)
+
+    @property
+    def available_tools(self) -> List[Tool]:
+        """Get the tools of all connected servers
+
+        Returns:
+            List of available tools
+        """
+        return [tool for _, tool in self.tool_registry.values()]
+
+    async def disconnect_all(self) -> None:
+        """Disconnect from all servers"""
+        await asyncio.gather(
+            *(session.disconnect() for session in self.sessions.values()),
+            return_exceptions=True,
+        )
+        self.sessions = {}
+        self.tool_registry = {}
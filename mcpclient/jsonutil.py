@@ -0,0 +1,69 @@
+import json
+from typing import Any, Callable, Optional, Union
+
+# orjson is optional; it parses and serialises small documents several times
+# faster than the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses this, so one except clause covers both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse a JSON document
+
+    Args:
+        data: JSON text
+
+    Returns:
+        Parsed value
+
+    Raises:
+        JSONDecodeError: If the text is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(
+    obj: Any,
+    indent: bool = False,
+    sort_keys: bool = False,
+    default: Optional[Callable[[Any], Any]] = None,
+) -> str:
+    """Serialise a value as JSON
+
+    Output is compact unless indented, with non-ASCII characters kept as
+    they are. The two backends agree on JSON-native data (dicts with string
+    keys, lists, strings, finite numbers, booleans and None). Beyond that
+    they differ: orjson rejects non-string keys, serialises dataclasses and
+    datetimes itself instead of calling default, and writes NaN as null.
+
+    Args:
+        obj: Value to serialise
+        indent: Indent nested values by two spaces
+        sort_keys: Sort object keys
+        default: Called for values that are not JSON serialisable
+
+    Returns:
+        JSON text
+    """
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option).decode()
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        ensure_ascii=False,
+        sort_keys=sort_keys,
+        default=default,
+    )
@@ -0,0 +1,32 @@
+from dotenv import load_dotenv
+
+from mcpclient.llm.base import BaseLLM
+
+# API keys may come from a .env file; read it once for every backend
+load_dotenv()
+
+
+def create_llm(name: str = "gpt") -> BaseLLM:
+    """Create an LLM integration by name
+
+    Each backend is imported only when requested, so a process never loads
+    the SDK of a provider it does not use.
+
+    Args:
+        name: "gpt" for GitHub's GPT model or "gemini" for Google Gemini
+
+    Returns:
+        New LLM instance
+
+    Raises:
+        ValueError: If the name is not a known backend
+    """
+    if name == "gpt":
+        from mcpclient.llm.gpt4o import GptLLM
+
+        return GptLLM()
+    if name == "gemini":
+        from mcpclient.llm.gemini import GeminiLLM
+
+        return GeminiLLM()
+    raise ValueError(f"Unknown LLM backend: {name}")
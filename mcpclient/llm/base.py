@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, AsyncGenerator, Optional
 
@@ -5,6 +6,9 @@ from typing import List, Dict, Any, AsyncGenerator, Optional
 class BaseLLM(ABC):
     """Base class for LLM integration"""
 
+    # Most requests generate_batch sends to the provider at once
+    max_concurrent_requests = 16
+
     @abstractmethod
     async def generate(
         self, messages: List[Dict[str, Any]], tool_info: Optional[str] = None
@@ -34,3 +38,30 @@ class BaseLLM(ABC):
             Generated text chunks
         """
         pass
+
+    async def aclose(self) -> None:
+        """Release resources held by the integration, such as HTTP clients"""
+
+    async def generate_batch(
+        self,
+        batch_messages: List[List[Dict[str, Any]]],
+        tool_info: Optional[str] = None,
+    ) -> List[str]:
+        """Generate responses for independent conversations concurrently
+
+        Args:
+            batch_messages: Messages for each conversation
+            tool_info: Information about available tools
+
+        Returns:
+            Generated text for each conversation, in order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def generate_one(messages: List[Dict[str, Any]]) -> str:
+            async with semaphore:
+                return await self.generate(messages, tool_info)
+
+        return list(
+            await asyncio.gather(*(generate_one(messages) for messages in batch_messages))
+        )
@@ -0,0 +1,189 @@
+import asyncio
+import hashlib
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from mcpclient import jsonutil
+
+
+# Text encoder for the semantic tier: maps text to an embedding vector
+Encoder = Callable[[str], Sequence[float]]
+
+
+def sentence_transformer_encoder(model_name: str = "all-MiniLM-L6-v2") -> Encoder:
+    """Create a text encoder backed by sentence-transformers
+
+    Args:
+        model_name: Name of the sentence-transformers model to load
+
+    Returns:
+        Function mapping text to an embedding vector
+
+    Raises:
+        ImportError: If sentence-transformers is not installed
+    """
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+
+    def encode(text: str) -> Sequence[float]:
+        return model.encode(text).tolist()
+
+    return encode
+
+
+def _normalize(vector: Sequence[float]) -> List[float]:
+    """Scale a vector to unit length, so a dot product gives cosine similarity
+
+    Args:
+        vector: Embedding vector
+
+    Returns:
+        Unit-length copy of the vector
+    """
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+class ResponseCache:
+    """In-memory LRU cache of LLM responses with time-based expiry
+
+    Responses are matched exactly by key. With an encoder, a semantic tier
+    also matches queries whose embedding is close to a cached query's.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        ttl: Optional[float] = 3600,
+        encoder: Optional[Encoder] = None,
+        similarity_threshold: float = 0.92,
+    ):
+        """Initialize the cache
+
+        Args:
+            max_entries: Maximum number of responses to keep
+            ttl: Seconds before an entry expires, or None to never expire
+            encoder: Text encoder enabling the semantic tier, or None
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.encoder = encoder
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        # Per scope, the (key, unit embedding) of each query stored there
+        self._vectors: Dict[str, List[Tuple[str, List[float]]]] = {}
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from JSON-serialisable parts
+
+        Args:
+            parts: Values identifying the request
+
+        Returns:
+            Hex digest of the parts
+        """
+        data = jsonutil.dumps(parts, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached response, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, response = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return response
+
+    async def encode(self, text: str) -> Optional[List[float]]:
+        """Embed a query for the semantic tier
+
+        The encoder runs in a worker thread so it does not block the event
+        loop. The result serves both get_similar and set.
+
+        Args:
+            text: Query text
+
+        Returns:
+            Unit-length embedding, or None if the semantic tier is disabled
+        """
+        if self.encoder is None:
+            return None
+        return _normalize(await asyncio.to_thread(self.encoder, text))
+
+    def get_similar(self, scope: str, vector: List[float]) -> Optional[str]:
+        """Get the cached response for the most similar query in a scope
+
+        Args:
+            scope: Key of everything besides the query that shapes the response
+            vector: Query embedding from encode
+
+        Returns:
+            The cached response, or None if no query is similar enough
+        """
+        if not self._vectors.get(scope):
+            return None
+
+        best_key = None
+        best_score = self.similarity_threshold
+        # Drop vectors whose responses were evicted while scanning
+        live = []
+        for key, stored in self._vectors[scope]:
+            if key not in self._entries:
+                continue
+            live.append((key, stored))
+            score = sum(a * b for a, b in zip(vector, stored))
+            if score >= best_score:
+                best_key, best_score = key, score
+        self._vectors[scope] = live
+
+        if best_key is None:
+            return None
+        return self.get(best_key)
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        scope: Optional[str] = None,
+        vector: Optional[List[float]] = None,
+    ) -> None:
+        """Store a response
+
+        Args:
+            key: Cache key
+            response: Response text
+            scope: Semantic tier scope, see get_similar
+            vector: Query embedding from encode, to index the response in
+                the semantic tier
+        """
+        self._entries[key] = (time.monotonic(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        if scope is not None and vector is not None:
+            vectors = self._vectors.setdefault(scope, [])
+            if all(stored != key for stored, _ in vectors):
+                vectors.append((key, vector))
+
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        self._entries.clear()
+        self._vectors.clear()
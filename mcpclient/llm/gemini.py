@@ -1,24 +1,59 @@
+import asyncio
+import datetime
 import os
+import time
 from typing import List, Dict, Any, AsyncGenerator, Optional
 import google.generativeai as genai
 
 from .base import BaseLLM
-from dotenv import load_dotenv
+from mcpclient.tools.toon import to_toon
 
-load_dotenv()
+# API key genai was last configured with; configure() sets library-wide state
+_configured_api_key: Optional[str] = None
+
+
+def _response_text(response) -> str:
+    """Get the text of a response or streamed chunk
+
+    Reads the first candidate's parts directly; the SDK's text property
+    validates and joins every candidate on each access, and raises rather
+    than returning nothing when generation was stopped, e.g. for safety.
+
+    Args:
+        response: Gemini response or chunk
+
+    Returns:
+        Generated text, or an empty string if there is none
+    """
+    try:
+        parts = response.candidates[0].content.parts
+    except IndexError:
+        # No candidates, e.g. the prompt was blocked
+        return ""
+    except AttributeError:
+        return getattr(response, "text", "") or ""
+
+    if len(parts) == 1:
+        return parts[0].text
+    return "".join(part.text for part in parts)
 
 
 class GeminiLLM(BaseLLM):
     """Gemini LLM integration"""
 
     def __init__(
-        self, api_key: Optional[str] = None, model_name: str = "gemini-2.0-flash"
+        self,
+        api_key: Optional[str] = None,
+        model_name: str = "gemini-2.0-flash",
+        context_cache_ttl: Optional[float] = None,
     ):
         """Initialize Gemini LLM
 
         Args:
             api_key: Gemini API key
             model_name: Model name
+            context_cache_ttl: Seconds to keep the tool info in Gemini's
+                context cache, or None to send it with every call
         """
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY")
         if not self.api_key:
@@ -27,79 +62,191 @@ class GeminiLLM(BaseLLM):
             )
 
         self.model_name = model_name
-        genai.configure(api_key=self.api_key)
+        global _configured_api_key
+        if self.api_key != _configured_api_key:
+            genai.configure(api_key=self.api_key)
+            _configured_api_key = self.api_key
+
+        # Model built for the most recent tool info, reused while it is unchanged
+        self._model = None
+        self._model_tool_info: Optional[str] = None
+
+        # Context cache holding the tool info, and when its expiry was last set
+        self.context_cache_ttl = context_cache_ttl
+        self._context_cache = None
+        self._context_cache_refreshed = 0.0
+
+        # Messages converted by the last call, and the messages they came from
+        self._prepared_source: List[Dict[str, Any]] = []
+        self._prepared: List[Optional[Dict[str, Any]]] = []
+
+    async def _get_model(self, tool_info: Optional[str] = None):
+        """Get the Gemini model instance
+
+        The tool info is fixed for a connected session, so the model is
+        built once and rebuilt only when the tool info changes.
+
+        Args:
+            tool_info: Information about available tools, sent as the system
+                instruction so it forms a stable prefix across calls
+        """
+        if self._model is not None and tool_info == self._model_tool_info:
+            if await self._refresh_context_cache():
+                return self._model
+            # The cache expired or was deleted, so rebuild the model below
 
-    def _create_model(self):
-        """Create Gemini model instance"""
-        return genai.GenerativeModel(
-            model_name=self.model_name,
-            generation_config={"max_output_tokens": 1000, "temperature": 0.2},
+        generation_config = {"max_output_tokens": 1000, "temperature": 0.2}
+        await self._drop_context_cache()
+        if tool_info and self.context_cache_ttl is not None:
+            self._model = await self._create_cached_model(tool_info, generation_config)
+        if self._context_cache is None:
+            self._model = genai.GenerativeModel(
+                model_name=self.model_name,
+                generation_config=generation_config,
+                system_instruction=tool_info,
+            )
+        self._model_tool_info = tool_info
+        return self._model
+
+    async def _create_cached_model(
+        self, tool_info: str, generation_config: Dict[str, Any]
+    ):
+        """Store the tool info in Gemini's context cache and build a model on it
+
+        Later calls reference the cache instead of resending the tool info.
+
+        Args:
+            tool_info: Information about available tools
+            generation_config: Generation settings for the model
+
+        Returns:
+            Model using the cached tool info, or None if the cache could not
+            be created, e.g. because the tool info is below the model's
+            minimum cacheable size
+        """
+        try:
+            self._context_cache = await asyncio.to_thread(
+                genai.caching.CachedContent.create,
+                model=f"models/{self.model_name}",
+                system_instruction=tool_info,
+                ttl=datetime.timedelta(seconds=self.context_cache_ttl),
+            )
+        except Exception as e:
+            print(f"⚠️ Context cache unavailable, sending tool info per call: {e}")
+            return None
+
+        self._context_cache_refreshed = time.monotonic()
+        return genai.GenerativeModel.from_cached_content(
+            self._context_cache, generation_config=generation_config
         )
 
-    def _prepare_messages(
-        self, messages: List[Dict[str, Any]], tool_info: Optional[str] = None
-    ) -> List[Dict[str, Any]]:
+    async def _refresh_context_cache(self) -> bool:
+        """Extend the context cache's expiry once half of it has elapsed
+
+        Returns:
+            False if the cache could not be extended and the model built on
+            it should be replaced, True otherwise
+        """
+        if self._context_cache is None:
+            return True
+        if time.monotonic() - self._context_cache_refreshed < self.context_cache_ttl / 2:
+            return True
+
+        try:
+            await asyncio.to_thread(
+                self._context_cache.update,
+                ttl=datetime.timedelta(seconds=self.context_cache_ttl),
+            )
+        except Exception as e:
+            print(f"⚠️ Context cache could not be extended, recreating it: {e}")
+            return False
+
+        self._context_cache_refreshed = time.monotonic()
+        return True
+
+    async def _drop_context_cache(self) -> None:
+        """Delete the context cache for tool info that is no longer used"""
+        if self._context_cache is None:
+            return
+
+        cache, self._context_cache = self._context_cache, None
+        try:
+            await asyncio.to_thread(cache.delete)
+        except Exception:
+            # It expires on its own
+            pass
+
+    def _prepare_message(self, msg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Convert a single message to Gemini's format
+
+        Args:
+            msg: Input message
+
+        Returns:
+            Gemini message, or None if the message should be skipped
+        """
+        role = msg["role"]
+        content = msg["content"]
+
+        # Convert tool results to a formatted text representation
+        if role == "tool":
+            # Tool results need to be formatted as text since Gemini Python SDK
+            # doesn't directly support functionResponse in parts
+            if isinstance(content, dict):
+                tool_name = content.get("tool_name", "unknown_tool")
+                tool_result = content.get("result")
+                tool_error = content.get("error")
+
+                # Format as clearly marked text that the LLM can understand
+                formatted_text = f"### TOOL RESULT: {tool_name}\n"
+                if tool_result is not None:
+                    if not isinstance(tool_result, str):
+                        tool_result = to_toon(tool_result)
+                    formatted_text += f"{tool_result}\n"
+                elif tool_error is not None:
+                    formatted_text += f"ERROR: {tool_error}\n"
+
+                # Add as a user message since Gemini understands user/model roles
+                return {"role": "user", "parts": [{"text": formatted_text}]}
+
+            # Fallback for unexpected format
+            return {"role": "user", "parts": [{"text": f"Tool result: {str(content)}"}]}
+
+        if role == "user":
+            return {"role": "user", "parts": [{"text": content}]}
+
+        if role == "model" and content:  # Skip empty model responses
+            return {"role": "model", "parts": [{"text": content}]}
+
+        return None
+
+    def _prepare_messages(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Prepare messages for Gemini
 
+        The client only appends to its history between calls, so messages
+        converted by the previous call are reused and only new ones are
+        converted.
+
         Args:
             messages: Input messages
-            tool_info: Information about available tools
 
         Returns:
             Properly formatted messages for Gemini
         """
-        gemini_messages = []
-
-        for i, msg in enumerate(messages):
-            role = msg["role"]
-            content = msg["content"]
-
-            # Convert tool results to a formatted text representation
-            if role == "tool":
-                # Tool results need to be formatted as text since Gemini Python SDK
-                # doesn't directly support functionResponse in parts
-                if isinstance(content, dict):
-                    tool_name = content.get("tool_name", "unknown_tool")
-                    tool_result = content.get("result")
-                    tool_error = content.get("error")
-
-                    # Format as clearly marked text that the LLM can understand
-                    formatted_text = f"### TOOL RESULT: {tool_name}\n"
-                    if tool_result is not None:
-                        formatted_text += f"{tool_result}\n"
-                    elif tool_error is not None:
-                        formatted_text += f"ERROR: {tool_error}\n"
-
-                    # Add as a user message since Gemini understands user/model roles
-                    gemini_messages.append(
-                        {"role": "user", "parts": [{"text": formatted_text}]}
-                    )
-                else:
-                    # Fallback for unexpected format
-                    gemini_messages.append(
-                        {
-                            "role": "user",
-                            "parts": [{"text": f"Tool result: {str(content)}"}],
-                        }
-                    )
-
-            elif role == "user":
-                user_content = content
-                # Add tool info to the first user message only
-                if i == 0 and tool_info:
-                    user_content += tool_info
-
-                gemini_messages.append(
-                    {"role": "user", "parts": [{"text": user_content}]}
-                )
-
-            elif role == "model":
-                if content:  # Skip empty model responses
-                    gemini_messages.append(
-                        {"role": "model", "parts": [{"text": content}]}
-                    )
-
-        return gemini_messages
+        # Length of the leading run of messages unchanged since the last call
+        reused = 0
+        for previous, msg in zip(self._prepared_source, messages):
+            if previous is not msg:
+                break
+            reused += 1
+
+        del self._prepared_source[reused:]
+        del self._prepared[reused:]
+        for msg in messages[reused:]:
+            self._prepared_source.append(msg)
+            self._prepared.append(self._prepare_message(msg))
+
+        return [converted for converted in self._prepared if converted is not None]
 
     async def generate(
         self, messages: List[Dict[str, Any]], tool_info: Optional[str] = None
@@ -113,11 +260,11 @@ class GeminiLLM(BaseLLM):
         Returns:
             Generated text
         """
-        model = self._create_model()
-        gemini_messages = self._prepare_messages(messages, tool_info)
+        model = await self._get_model(tool_info)
+        gemini_messages = self._prepare_messages(messages)
 
-        response = model.generate_content(gemini_messages)
-        return response.text if hasattr(response, "text") else ""
+        response = await model.generate_content_async(gemini_messages)
+        return _response_text(response)
 
     async def generate_streaming(
         self, messages: List[Dict[str, Any]], tool_info: Optional[str] = None
@@ -131,11 +278,12 @@ class GeminiLLM(BaseLLM):
         Yields:
             Generated text chunks
         """
-        model = self._create_model()
-        gemini_messages = self._prepare_messages(messages, tool_info)
+        model = await self._get_model(tool_info)
+        gemini_messages = self._prepare_messages(messages)
 
-        response = model.generate_content(gemini_messages, stream=True)
+        response = await model.generate_content_async(gemini_messages, stream=True)
 
-        for chunk in response:
-            if hasattr(chunk, "text"):
-                yield chunk.text
+        async for chunk in response:
+            text = _response_text(chunk)
+            if text:
+                yield text
@@ -1,14 +1,13 @@
 import os
-import asyncio
 from typing import List, Dict, Any, AsyncGenerator, Optional, cast
-from openai import OpenAI, AsyncOpenAI
+from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionMessageParam, ChatCompletionSystemMessageParam, ChatCompletionUserMessageParam, ChatCompletionAssistantMessageParam
 
 from .base import BaseLLM
-from dotenv import load_dotenv
+from mcpclient.tools.toon import to_toon
 
-load_dotenv()
 endpoint = "https://models.github.ai/inference"
+SYSTEM_PROMPT = "You are a helpful assistant."
 
 class GptLLM(BaseLLM):
     """OpenAI LLM integration for GitHub's models"""
@@ -28,25 +27,75 @@ class GptLLM(BaseLLM):
             )
         self.model_name = model_name
 
-    def _create_sync_client(self):
-        """Create synchronous OpenAI client for GitHub models"""
-        return OpenAI(
+        # One client for the lifetime of the LLM, so its pooled connections
+        # are kept alive and reused instead of reconnecting on every call
+        self._client = AsyncOpenAI(
             base_url=endpoint,
             api_key=self.api_key,
         )
 
-    def _create_async_client(self):
-        """Create asynchronous OpenAI client for GitHub models"""
-        return AsyncOpenAI(
-            base_url=endpoint,
-            api_key=self.api_key,
-        )
+        # System message built for the most recent tool info
+        self._system_message: Optional[ChatCompletionSystemMessageParam] = None
+        self._system_tool_info: Optional[str] = None
+
+        # Messages converted by the last call, and the messages they came from
+        self._prepared_source: List[Dict[str, Any]] = []
+        self._prepared: List[Optional[ChatCompletionMessageParam]] = []
+
+    def _prepare_message(
+        self, msg: Dict[str, Any]
+    ) -> Optional[ChatCompletionMessageParam]:
+        """Convert a single message to OpenAI's format
+
+        Args:
+            msg: Input message
+
+        Returns:
+            OpenAI message, or None if the message should be skipped
+        """
+        role = msg["role"]
+        content = msg["content"]
+
+        if role == "user":
+            user_message: ChatCompletionUserMessageParam = {"role": "user", "content": content}
+            return user_message
+
+        if role == "model" or role == "assistant":
+            # OpenAI uses "assistant" rather than "model"
+            if content:  # Skip empty responses
+                assistant_message: ChatCompletionAssistantMessageParam = {"role": "assistant", "content": content}
+                return assistant_message
+            return None
+
+        if role == "tool":
+            # Convert tool messages to user messages in the format client.py expects
+            tool_content = "TOOL RESULT: "
+            if isinstance(content, dict):
+                tool_name = content.get("tool_name", "unknown_tool")
+                tool_content += f"{tool_name}\n"
+
+                if "result" in content:
+                    result = content["result"]
+                    tool_content += result if isinstance(result, str) else to_toon(result)
+                elif "error" in content:
+                    tool_content += f"ERROR: {content['error']}"
+            else:
+                tool_content += str(content)
+
+            tool_message: ChatCompletionUserMessageParam = {"role": "user", "content": tool_content}
+            return tool_message
+
+        return None
 
     def _prepare_messages(
         self, messages: List[Dict[str, Any]], tool_info: Optional[str] = None
     ) -> List[ChatCompletionMessageParam]:
         """Prepare messages for OpenAI
 
+        The client only appends to its history between calls, so messages
+        converted by the previous call are reused and only new ones are
+        converted.
+
         Args:
             messages: Input messages
             tool_info: Information about available tools
@@ -54,44 +103,35 @@ class GptLLM(BaseLLM):
         Returns:
             Properly formatted messages for OpenAI
         """
-        openai_messages: List[ChatCompletionMessageParam] = []
-        system_message: ChatCompletionSystemMessageParam = {"role": "system", "content": "You are a helpful assistant."}
-        openai_messages.append(system_message)
-
-        for i, msg in enumerate(messages):
-            role = msg["role"]
-            content = msg["content"]
-
-            if role == "user":
-                # Add tool info to the first user message if provided
-                if i == 0 and tool_info:
-                    content = f"{content}\n\n{tool_info}"
-                user_message: ChatCompletionUserMessageParam = {"role": "user", "content": content}
-                openai_messages.append(user_message)
-
-            elif role == "model" or role == "assistant":
-                # OpenAI uses "assistant" rather than "model"
-                if content:  # Skip empty responses
-                    assistant_message: ChatCompletionAssistantMessageParam = {"role": "assistant", "content": content}
-                    openai_messages.append(assistant_message)
-
-            elif role == "tool":
-                # Convert tool messages to user messages in the format client.py expects
-                tool_content = "TOOL RESULT: "
-                if isinstance(content, dict):
-                    tool_name = content.get("tool_name", "unknown_tool")
-                    tool_content += f"{tool_name}\n"
-
-                    if "result" in content:
-                        tool_content += str(content["result"])
-                    elif "error" in content:
-                        tool_content += f"ERROR: {content['error']}"
-                else:
-                    tool_content += str(content)
-
-                tool_message: ChatCompletionUserMessageParam = {"role": "user", "content": tool_content}
-                openai_messages.append(tool_message)
-
+        # Tool info goes in the system message, so every call for a session
+        # starts with the same prefix and hits OpenAI's prompt cache. It is
+        # fixed for a connected session, so the message is built only when
+        # the tool info changes.
+        if self._system_message is None or tool_info != self._system_tool_info:
+            system_content = SYSTEM_PROMPT
+            if tool_info:
+                system_content = f"{SYSTEM_PROMPT}\n\n{tool_info}"
+            self._system_message = {"role": "system", "content": system_content}
+            self._system_tool_info = tool_info
+        system_message = self._system_message
+
+        # Length of the leading run of messages unchanged since the last call
+        reused = 0
+        for previous, msg in zip(self._prepared_source, messages):
+            if previous is not msg:
+                break
+            reused += 1
+
+        del self._prepared_source[reused:]
+        del self._prepared[reused:]
+        for msg in messages[reused:]:
+            self._prepared_source.append(msg)
+            self._prepared.append(self._prepare_message(msg))
+
+        openai_messages: List[ChatCompletionMessageParam] = [system_message]
+        openai_messages.extend(
+            converted for converted in self._prepared if converted is not None
+        )
         return openai_messages
 
     async def generate(
@@ -108,18 +148,12 @@ class GptLLM(BaseLLM):
         """
         openai_messages = self._prepare_messages(messages, tool_info)
 
-        # Run the API call in a thread pool to avoid blocking
-        loop = asyncio.get_running_loop()
-        client = self._create_sync_client()
-
-        response = await loop.run_in_executor(
-            None,
-            lambda: client.chat.completions.create(
-                model=self.model_name,
-                messages=openai_messages,
-                temperature=0.2,
-                max_tokens=3000
-            )
+        # The async client awaits the request without tying up a thread
+        response = await self._client.chat.completions.create(
+            model=self.model_name,
+            messages=openai_messages,
+            temperature=0.2,
+            max_tokens=3000
         )
 
         # Handle potential None case
@@ -138,11 +172,10 @@ class GptLLM(BaseLLM):
         Yields:
             Generated text chunks
         """
-        client = self._create_async_client()
         openai_messages = self._prepare_messages(messages, tool_info)
 
         try:
-            response = await client.chat.completions.create(
+            response = await self._client.chat.completions.create(
                 model=self.model_name,
                 messages=openai_messages,
                 temperature=0.2,
@@ -158,3 +191,7 @@ class GptLLM(BaseLLM):
             yield f"\n[Error in LLM streaming: {str(e)}]"
             # Re-raise to let caller handle it
             raise
+
+    async def aclose(self) -> None:
+        """Close the HTTP client and its pooled connections"""
+        await self._client.close()
@@ -1,4 +1,4 @@
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from mcp.types import Tool
 from mcpclient.connectors.base import BaseConnector
 
@@ -15,6 +15,10 @@ class MCPSession:
         self.connector = connector
         self.session_info: Optional[Dict[str, Any]] = None
         self.tools: List[Tool] = []
+        self.tools_by_name: Dict[str, Tool] = {}
+        # Argument validators compiled from the tools' schemas, by tool name
+        self.validators: Dict[str, Optional[Callable[[Any], Any]]] = {}
+        self._tool_info_cache: Optional[str] = None
 
     async def __aenter__(self):
         """Enter the async context manager"""
@@ -32,6 +36,7 @@ class MCPSession:
     async def disconnect(self) -> None:
         """Disconnect from the MCP implementation"""
         await self.connector.disconnect()
+        self._tool_info_cache = None
 
     async def initialize(self) -> Dict[str, Any]:
         """Initialize the MCP session
@@ -40,9 +45,46 @@ class MCPSession:
             Session information
         """
         self.session_info = await self.connector.initialize()  # type: ignore
-        self.tools = self.connector.tools
+        self._set_tools(self.connector.tools)
         return self.session_info or {}
 
+    def _set_tools(self, tools: List[Tool]) -> None:
+        """Replace the cached tool list
+
+        Args:
+            tools: List of tools
+        """
+        self.tools = tools
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.validators = {}
+        self._tool_info_cache = None
+
+    def invalidate_tools(self) -> None:
+        """Force the tool list to be re-fetched before the next query
+
+        For servers that change their tools without sending a
+        tools/list_changed notification.
+        """
+        self.connector.invalidate_tools()
+
+    async def refresh_tools(self) -> bool:
+        """Re-fetch the tool list if the server reported a change
+
+        The tool list is cached from initialization and only re-fetched
+        after a tools/list_changed notification or invalidate_tools().
+
+        Returns:
+            True if the tool list was re-fetched
+        """
+        if not self.connector.tools_changed:
+            return False
+        self._set_tools(await self.connector.list_tools())
+        return True
+
+    async def ping(self) -> None:
+        """Check that the server is responsive"""
+        await self.connector.ping()
+
     async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
         """Call an MCP tool
 
@@ -55,6 +97,17 @@ class MCPSession:
         """
         return await self.connector.call_tool(name, arguments)
 
+    def get_tool(self, name: str) -> Optional[Tool]:
+        """Get a tool by name
+
+        Args:
+            name: Tool name
+
+        Returns:
+            The tool if found, None otherwise
+        """
+        return self.tools_by_name.get(name)
+
     @property
     def available_tools(self) -> List[Tool]:
         """Get available tools
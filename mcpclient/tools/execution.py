@@ -1,6 +1,154 @@
-import json
-from typing import Dict, Any, List, Tuple, Optional
-import traceback
+from typing import Callable, Dict, Any, List, Tuple, Optional, Union
+import asyncio
+import io
+import logging
+
+from mcpclient import jsonutil
+from mcpclient.tools.toon import compact_text, to_toon
+
+logger = logging.getLogger(__name__)
+
+# fastjsonschema is optional; it compiles a schema into a validator function,
+# which checks the full schema rather than only property types
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+
+def _compile_validator(schema: Dict[str, Any]) -> Optional[Callable[[Any], Any]]:
+    """Compile a validator for a tool's input schema
+
+    Args:
+        schema: JSON schema of the tool's arguments
+
+    Returns:
+        Validator function, or None if fastjsonschema is not installed or
+        cannot compile the schema
+    """
+    if fastjsonschema is None:
+        return None
+    try:
+        return fastjsonschema.compile(schema)
+    except fastjsonschema.JsonSchemaDefinitionException:
+        # Fall back to the basic type checks
+        return None
+
+
+# Each coercer returns (value, None) with the value converted to its JSON
+# schema type, or (None, error) if it cannot be converted
+_Coercion = Tuple[Any, Optional[str]]
+
+
+def _to_string(value: Any) -> _Coercion:
+    """Convert a value to a string"""
+    return (value if isinstance(value, str) else str(value)), None
+
+
+def _to_number(value: Any) -> _Coercion:
+    """Convert a value to a number"""
+    if isinstance(value, (int, float)):
+        return value, None
+    try:
+        return float(value), None
+    except (ValueError, TypeError):
+        return None, "must be a number"
+
+
+def _to_integer(value: Any) -> _Coercion:
+    """Convert a value to an integer"""
+    if isinstance(value, int):
+        return value, None
+    try:
+        return int(value), None
+    except (ValueError, TypeError):
+        return None, "must be an integer"
+
+
+def _to_boolean(value: Any) -> _Coercion:
+    """Convert a value, or "true"/"false" in any case, to a boolean"""
+    if isinstance(value, bool):
+        return value, None
+    # Handle string representations of booleans
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered == "true":
+            return True, None
+        if lowered == "false":
+            return False, None
+    return None, "must be a boolean"
+
+
+def _from_json(value: Any, expected: type, opener: str, error: str) -> _Coercion:
+    """Keep a value of the expected type, or parse it from a JSON string"""
+    if isinstance(value, expected):
+        return value, None
+    # Try to convert a string that looks like JSON
+    if isinstance(value, str) and value.strip().startswith(opener):
+        try:
+            return jsonutil.loads(value), None
+        except jsonutil.JSONDecodeError:
+            pass
+    return None, error
+
+
+def _to_array(value: Any) -> _Coercion:
+    """Convert a value, or a JSON array string, to a list"""
+    return _from_json(value, list, "[", "must be an array")
+
+
+def _to_object(value: Any) -> _Coercion:
+    """Convert a value, or a JSON object string, to a dict"""
+    return _from_json(value, dict, "{", "must be an object")
+
+
+def _to_null(value: Any) -> _Coercion:
+    """Check that a value is null"""
+    return (None, None) if value is None else (None, "must be null")
+
+
+_COERCERS: Dict[str, Callable[[Any], _Coercion]] = {
+    "string": _to_string,
+    "number": _to_number,
+    "integer": _to_integer,
+    "boolean": _to_boolean,
+    "array": _to_array,
+    "object": _to_object,
+    "null": _to_null,
+}
+
+
+def _coerce(value: Any, prop_type: Union[str, List[str]]) -> _Coercion:
+    """Convert a value to a property's JSON schema type
+
+    Args:
+        value: Argument value
+        prop_type: Type, or list of allowed types, from the property schema
+
+    Returns:
+        Tuple of (converted value, error message or None)
+    """
+    types = prop_type if isinstance(prop_type, list) else [prop_type]
+
+    # Handle null values
+    if value is None:
+        if "null" in types:
+            return None, None
+        return None, "cannot be null"
+
+    # A value that already has one of the types is kept as is; otherwise
+    # the first type it converts to wins. Unknown types are not checked.
+    first = None
+    for type_name in types:
+        coercer = _COERCERS.get(type_name)
+        if coercer is None:
+            return value, None
+        result = coercer(value)
+        if result[1] is None and result[0] is value:
+            return result
+        if first is None or (first[1] is not None and result[1] is None):
+            first = result
+    return first if first is not None else (value, None)
 
 
 class ToolExecutor:
@@ -8,7 +156,10 @@ class ToolExecutor:
 
     @staticmethod
     async def execute_tool(
-        session, tool_name: str, tool_args: Dict[str, Any]
+        session,
+        tool_name: str,
+        tool_args: Dict[str, Any],
+        timeout: Optional[float] = 120,
     ) -> Tuple[bool, Any, str]:
         """Execute a tool and process the result
 
@@ -16,69 +167,180 @@ class ToolExecutor:
             session: The MCP session
             tool_name: Name of the tool to execute
             tool_args: Arguments for the tool
+            timeout: Seconds the call may take, or None to wait indefinitely
 
         Returns:
             Tuple of (success, result, formatted_result)
         """
         try:
-            # Execute tool
-            result = await session.call_tool(tool_name, tool_args)
+            # Execute tool, so a hung server cannot block the caller forever
+            result = await asyncio.wait_for(
+                session.call_tool(tool_name, tool_args), timeout
+            )
 
             # Format the result for display
             formatted_result = ToolExecutor.format_tool_result(result)
 
             return True, result, formatted_result
 
+        except asyncio.TimeoutError:
+            return False, None, f"Tool '{tool_name}' timed out after {timeout} seconds"
+
         except Exception as e:
             error_msg = f"Error executing tool '{tool_name}': {str(e)}"
-            traceback.print_exc()
+            # Formatted only if the log level lets the record through
+            logger.exception("Tool %s failed", tool_name)
             return False, None, error_msg
 
     @staticmethod
-    def format_tool_result(result) -> str:
+    async def execute_tools_parallel(
+        session,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        concurrency: int = 8,
+        tools_by_name: Optional[Dict[str, Any]] = None,
+    ) -> List[Tuple[bool, Any, str]]:
+        """Execute independent tool calls concurrently
+
+        Calls run one at a time instead if any of them is to a tool whose
+        input schema sets "x-stateful": true, since such tools may depend
+        on the effects of earlier calls.
+
+        Args:
+            session: The MCP session
+            calls: List of tuples containing (tool_name, parameters)
+            concurrency: Maximum number of calls running at once
+            tools_by_name: Available tools keyed by name, to check for
+                stateful tools; defaults to the session's tools_by_name
+
+        Returns:
+            Tuple of (success, result, formatted_result) for each call, in
+            the order of calls
+        """
+        if tools_by_name is None:
+            tools_by_name = getattr(session, "tools_by_name", None)
+        if tools_by_name and any(
+            ToolExecutor.is_stateful(tools_by_name.get(name)) for name, _ in calls
+        ):
+            concurrency = 1
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def execute_one(
+            tool_name: str, tool_args: Dict[str, Any]
+        ) -> Tuple[bool, Any, str]:
+            async with semaphore:
+                return await ToolExecutor.execute_tool(session, tool_name, tool_args)
+
+        return list(
+            await asyncio.gather(
+                *(execute_one(tool_name, tool_args) for tool_name, tool_args in calls)
+            )
+        )
+
+    @staticmethod
+    def is_stateful(tool) -> bool:
+        """Check whether a tool must not run concurrently with other calls
+
+        Args:
+            tool: The tool object, or None if unknown
+
+        Returns:
+            True if the tool's input schema sets "x-stateful"
+        """
+        schema = getattr(tool, "inputSchema", None)
+        return bool(schema and schema.get("x-stateful"))
+
+    @staticmethod
+    def format_tool_result(result, compact: bool = False) -> str:
         """Format tool result for display
 
         Args:
             result: The raw tool result
+            compact: Rewrite JSON output in the compact form of to_toon, for
+                sending to the LLM
 
         Returns:
             Formatted result string
         """
         # Handle different result types
-        if hasattr(result, "content"):
-            content = result.content
-
+        content = getattr(result, "content", None)
+        if content is not None:
             # Handle string content
             if isinstance(content, str):
-                return content
+                return compact_text(content) if compact else content
 
             # Handle list of content items
             if isinstance(content, list):
-                formatted_parts = []
-                for item in content:
-                    if hasattr(item, "text"):
-                        formatted_parts.append(item.text)
-                    elif hasattr(item, "data"):
-                        formatted_parts.append(f"[Image/Data: {item.data[:20]}...]")
-                    else:
-                        formatted_parts.append(str(item))
-                return "\n".join(formatted_parts)
+                # Most results are a single item, returned without copying
+                if len(content) == 1:
+                    return ToolExecutor._format_content_item(content[0], compact)
+
+                # Write items straight into one buffer rather than collecting
+                # a list of parts to join
+                buffer = io.StringIO()
+                for i, item in enumerate(content):
+                    if i:
+                        buffer.write("\n")
+                    buffer.write(ToolExecutor._format_content_item(item, compact))
+                return buffer.getvalue()
 
             # Handle other content types
-            return str(content).replace("\\n", "\n")
+            return ToolExecutor._format_value(content, compact)
 
         # Default fallback
         return str(result)
 
+    @staticmethod
+    def _format_content_item(item, compact: bool) -> str:
+        """Format one item of a tool result's content list
+
+        Args:
+            item: Content item, such as TextContent or ImageContent
+            compact: See format_tool_result
+
+        Returns:
+            Formatted item
+        """
+        text = getattr(item, "text", None)
+        if text is not None:
+            return compact_text(text) if compact else text
+
+        data = getattr(item, "data", None)
+        if data is not None:
+            return f"[Image/Data: {data[:20]}...]"
+
+        return ToolExecutor._format_value(item, compact)
+
+    @staticmethod
+    def _format_value(value, compact: bool) -> str:
+        """Format structured content as JSON
+
+        Args:
+            value: Content value, a plain value or a pydantic model
+            compact: See format_tool_result
+
+        Returns:
+            Formatted value
+        """
+        if hasattr(value, "model_dump"):
+            value = value.model_dump(mode="json", exclude_none=True)
+        if compact:
+            return to_toon(value)
+        return jsonutil.dumps(value, indent=True, default=str)
+
     @staticmethod
     def validate_tool_args(
-        tool, args: Dict[str, Any]
+        tool,
+        args: Dict[str, Any],
+        validators: Optional[Dict[str, Optional[Callable[[Any], Any]]]] = None,
     ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
         """Validate tool arguments against schema
 
         Args:
             tool: The tool object with schema
             args: The arguments to validate
+            validators: Compiled validators keyed by tool name, such as
+                MCPSession.validators, so each schema is compiled once
 
         Returns:
             Tuple of (is_valid, processed_args, error_message)
@@ -97,95 +359,53 @@ class ToolExecutor:
                     return False, None, f"Missing required field: {field}"
 
         # Check property types (basic validation)
-        if "properties" in schema:
-            for prop_name, prop_schema in schema["properties"].items():
-                if prop_name in args:
-                    prop_type = prop_schema.get("type")
-
-                    # Skip validation if type is not specified
-                    if not prop_type:
-                        continue
-
-                    value = args[prop_name]
-
-                    # Handle null values
-                    if value is None:
-                        if prop_type == "null" or (
-                            isinstance(prop_type, list) and "null" in prop_type
-                        ):
-                            continue
-                        else:
-                            return False, None, f"Field {prop_name} cannot be null"
-
-                    # Handle simple types
-                    if prop_type == "string" and not isinstance(value, str):
-                        # Try to convert to string
-                        processed_args[prop_name] = str(value)
-                    elif prop_type == "number" and not isinstance(value, (int, float)):
-                        try:
-                            processed_args[prop_name] = float(value)
-                        except (ValueError, TypeError):
-                            return False, None, f"Field {prop_name} must be a number"
-                    elif prop_type == "integer" and not isinstance(value, int):
-                        try:
-                            processed_args[prop_name] = int(value)
-                        except (ValueError, TypeError):
-                            return False, None, f"Field {prop_name} must be an integer"
-                    elif prop_type == "boolean" and not isinstance(value, bool):
-                        # Handle string representations of booleans
-                        if isinstance(value, str):
-                            if value.lower() == "true":
-                                processed_args[prop_name] = True
-                            elif value.lower() == "false":
-                                processed_args[prop_name] = False
-                            else:
-                                return (
-                                    False,
-                                    None,
-                                    f"Field {prop_name} must be a boolean",
-                                )
-                        else:
-                            return False, None, f"Field {prop_name} must be a boolean"
-                    elif prop_type == "array" and not isinstance(value, list):
-                        # Try to convert string to array if it looks like JSON
-                        if isinstance(value, str) and value.strip().startswith("["):
-                            try:
-                                processed_args[prop_name] = json.loads(value)
-                            except json.JSONDecodeError:
-                                return (
-                                    False,
-                                    None,
-                                    f"Field {prop_name} must be an array",
-                                )
-                        else:
-                            return False, None, f"Field {prop_name} must be an array"
-                    elif prop_type == "object" and not isinstance(value, dict):
-                        # Try to convert string to object if it looks like JSON
-                        if isinstance(value, str) and value.strip().startswith("{"):
-                            try:
-                                processed_args[prop_name] = json.loads(value)
-                            except json.JSONDecodeError:
-                                return (
-                                    False,
-                                    None,
-                                    f"Field {prop_name} must be an object",
-                                )
-                        else:
-                            return False, None, f"Field {prop_name} must be an object"
+        for prop_name, prop_schema in schema.get("properties", {}).items():
+            if prop_name not in args:
+                continue
+
+            prop_type = prop_schema.get("type")
+
+            # Skip validation if type is not specified
+            if not prop_type:
+                continue
+
+            value, error = _coerce(args[prop_name], prop_type)
+            if error is not None:
+                return False, None, f"Field {prop_name} {error}"
+            processed_args[prop_name] = value
+
+        # Check the coerced arguments against the full schema
+        if validators is None:
+            validator = _compile_validator(schema)
+        elif tool.name in validators:
+            validator = validators[tool.name]
+        else:
+            validator = validators[tool.name] = _compile_validator(schema)
+        if validator is not None:
+            try:
+                validator(processed_args)
+            except fastjsonschema.JsonSchemaValueException as e:
+                return False, None, e.message
 
         return True, processed_args, None
 
     @staticmethod
-    def find_tool_by_name(tools: List[Any], tool_name: str) -> Optional[Any]:
+    def find_tool_by_name(
+        tools: Union[List[Any], Dict[str, Any]], tool_name: str
+    ) -> Optional[Any]:
         """Find a tool by name
 
         Args:
-            tools: List of tools
+            tools: List of tools, or tools keyed by name such as
+                MCPSession.tools_by_name for a constant-time lookup
             tool_name: Name of the tool to find
 
         Returns:
             The tool object if found, None otherwise
         """
+        if isinstance(tools, dict):
+            return tools.get(tool_name)
+
         for tool in tools:
             if tool.name == tool_name:
                 return tool
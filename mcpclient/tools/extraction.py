@@ -2,19 +2,109 @@ import re
 import json
 from typing import List, Tuple, Dict, Any, Optional
 
+from mcpclient import jsonutil
+
+# Informal tool mention, used when no tool call is formatted correctly
+_MENTION_RE = re.compile(r"use the (\S+) tool", re.IGNORECASE)
+
+# A tool call whose parameters run to the first closing brace. Used only
+# when the scanner finds no complete call, so parameters that never close,
+# such as an unterminated string, still yield the call with empty arguments
+_TOOL_RE = re.compile(
+    r"TOOL:\s*([\w\-]+)\s*[\n\r]+\s*PARAMETERS:\s*({.*?})", re.DOTALL
+)
+
+# Header of a tool call, up to where the JSON parameters begin
+_TOOL_MARK = re.compile(r"TOOL:\s*([\w\-]+)\s*[\n\r]+\s*PARAMETERS:\s*")
+
+# Characters that matter when matching the braces of a JSON object
+_JSON_TOKEN = re.compile(r'[{}"]')
+
+# Rest of a JSON string after its opening quote, including the closing quote
+_JSON_STRING_REST = re.compile(r'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+def _find_object_end(text: str, start: int) -> int:
+    """Find the end of the JSON object starting at a position
+
+    Jumps between braces and quotes rather than stepping through every
+    character, and skips braces inside strings.
+
+    Args:
+        text: Text containing the object
+        start: Index of the object's opening brace
+
+    Returns:
+        Index just past the matching closing brace, or -1 if the object is
+        not closed
+    """
+    depth = 0
+    pos = start
+    while True:
+        token = _JSON_TOKEN.search(text, pos)
+        if token is None:
+            return -1
+        pos = token.end()
+
+        if token.group() == '"':
+            string = _JSON_STRING_REST.match(text, pos)
+            if string is None:
+                return -1
+            pos = string.end()
+        elif token.group() == "{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _scan_tool_calls(text: str) -> List[Tuple[str, str]]:
+    """Find tool calls and the JSON text of their parameters
+
+    Runs in linear time and handles parameters nested to any depth. Calls
+    whose parameters never close are skipped; extract_tool_calls falls back
+    to _TOOL_RE when none are found.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        List of tuples containing (tool_name, parameters JSON)
+    """
+    calls = []
+    pos = 0
+    while True:
+        pos = text.find("TOOL:", pos)
+        if pos < 0:
+            return calls
+
+        match = _TOOL_MARK.match(text, pos)
+        if not match or not text.startswith("{", match.end()):
+            pos += len("TOOL:")
+            continue
+
+        end = _find_object_end(text, match.end())
+        if end < 0:
+            pos = match.end()
+            continue
+
+        calls.append((match.group(1), text[match.end() : end]))
+        pos = end
+
 
 class ToolExtractor:
     """Extracts tool calls from text"""
 
     @staticmethod
     def extract_tool_calls(
-        text: str, available_tools: Optional[List[Any]] = None
+        text: str, tools_by_name: Optional[Dict[str, Any]] = None
     ) -> List[Tuple[str, Dict[str, Any]]]:
         """Extract tool calls from text
 
         Args:
             text: Text to extract tool calls from
-            available_tools: List of available tools for fallback matching
+            tools_by_name: Available tools keyed by name, for fallback matching
 
         Returns:
             List of tuples containing (tool_name, parameters)
@@ -22,28 +112,115 @@ class ToolExtractor:
         tool_calls = []
 
         # Look for the pattern TOOL: name followed by PARAMETERS: {...}
-        tool_pattern = re.compile(
-            r"TOOL:\s*([\w\-]+)\s*[\n\r]+\s*PARAMETERS:\s*({.*?})", re.DOTALL
-        )
-
-        matches = tool_pattern.findall(text)
+        matches = _scan_tool_calls(text) or _TOOL_RE.findall(text)
 
         for tool_name, params_str in matches:
             try:
                 # Try to parse the parameters as JSON
                 # Remove any surrounding markdown backticks
                 cleaned_params = params_str.strip("`").strip()
-                params = json.loads(cleaned_params)
+                params = jsonutil.loads(cleaned_params)
                 tool_calls.append((tool_name.strip(), params))
-            except json.JSONDecodeError:
+            except jsonutil.JSONDecodeError:
                 # If JSON parsing fails, add with empty params
                 tool_calls.append((tool_name.strip(), {}))
 
         # Also look for a simpler pattern in case the model doesn't format correctly
-        if not tool_calls and available_tools:
-            for tool in available_tools:
-                tool_mention = f"use the {tool.name} tool"
-                if tool_mention.lower() in text.lower():
-                    tool_calls.append((tool.name, {}))
+        if not tool_calls and tools_by_name:
+            # Scan the text once, then check each tool against the mentions
+            mentioned = {match.group(1).lower() for match in _MENTION_RE.finditer(text)}
+            if mentioned:
+                for tool_name in tools_by_name:
+                    if tool_name.lower() in mentioned:
+                        tool_calls.append((tool_name, {}))
+
+        return tool_calls
+
 
+class StreamingToolExtractor:
+    """Extracts tool calls incrementally from streamed text
+
+    Feed chunks as they arrive; each tool call is returned as soon as its
+    JSON parameters are complete, so it can be started before the rest of
+    the response has been generated.
+    """
+
+    def __init__(self):
+        """Initialize a new streaming extractor"""
+        self._buffer = ""
+        self._decoder = json.JSONDecoder()
+
+    def feed(self, chunk: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """Add a chunk of text and return any newly completed tool calls
+
+        Args:
+            chunk: Next chunk of streamed text
+
+        Returns:
+            List of tuples containing (tool_name, parameters)
+        """
+        self._buffer += chunk
+        tool_calls = []
+
+        while True:
+            start = self._buffer.find("TOOL:")
+            if start < 0:
+                # Keep a short tail in case the marker is split across chunks
+                self._buffer = self._buffer[-(len("TOOL:") - 1) :]
+                break
+
+            next_start = self._buffer.find("TOOL:", start + 1)
+            match = _TOOL_MARK.match(self._buffer, start)
+            if not match:
+                if next_start >= 0 or "PARAMETERS:" in self._buffer[start:]:
+                    # Not a well-formed tool call; skip past this marker
+                    self._buffer = self._buffer[start + 1 :]
+                    continue
+                # Header may still be arriving
+                self._buffer = self._buffer[start:]
+                break
+
+            params_start = match.end()
+            if params_start >= len(self._buffer):
+                self._buffer = self._buffer[start:]
+                break
+            if self._buffer[params_start] != "{":
+                self._buffer = self._buffer[start + 1 :]
+                continue
+
+            tool_name = match.group(1).strip()
+            try:
+                params, params_end = self._decoder.raw_decode(
+                    self._buffer, params_start
+                )
+            except json.JSONDecodeError:
+                # A later "TOOL:" may sit inside a string in the parameters,
+                # so only give up once the object's braces have closed
+                params_end = _find_object_end(self._buffer, params_start)
+                if params_end >= 0:
+                    # Malformed parameters
+                    tool_calls.append((tool_name, {}))
+                    self._buffer = self._buffer[params_end:]
+                    continue
+                # Parameters may still be arriving
+                self._buffer = self._buffer[start:]
+                break
+
+            tool_calls.append((tool_name, params))
+            self._buffer = self._buffer[params_end:]
+
+        return tool_calls
+
+    def finish(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Flush a trailing tool call whose parameters never parsed
+
+        Returns:
+            List of tuples containing (tool_name, parameters)
+        """
+        tool_calls = []
+        match = _TOOL_MARK.search(self._buffer)
+        if match and "}" in self._buffer[match.end() :]:
+            # Match extract_tool_calls, which keeps calls with invalid JSON
+            tool_calls.append((match.group(1).strip(), {}))
+        self._buffer = ""
         return tool_calls
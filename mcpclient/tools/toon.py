@@ -0,0 +1,79 @@
+from typing import Any
+
+from mcpclient import jsonutil
+
+# Tells the LLM how to read tabular tool results
+TOON_INSTRUCTION = (
+    "Tool results may be tables: the first line lists the fields as "
+    "'fields: a|b|c', and each following line is one pipe-delimited row.\n"
+)
+
+
+def _escape(value: Any) -> str:
+    """Format one table cell
+
+    Args:
+        value: Cell value
+
+    Returns:
+        Cell text with backslashes, pipes and newlines escaped
+    """
+    text = value if isinstance(value, str) else _compact_json(value)
+    return text.replace("\\", "\\\\").replace("|", "\\|").replace("\n", "\\n")
+
+
+def _compact_json(obj: Any) -> str:
+    """Serialise a value as JSON without insignificant whitespace
+
+    Args:
+        obj: Value to serialise
+
+    Returns:
+        JSON text
+    """
+    return jsonutil.dumps(obj, default=str)
+
+
+def to_toon(obj: Any) -> str:
+    """Format a value compactly for an LLM prompt
+
+    A list of objects that all have the same fields becomes a table, with
+    the field names given once instead of repeated on every record. Any
+    other value is written as compact JSON.
+
+    Args:
+        obj: Value to format
+
+    Returns:
+        Formatted text
+    """
+    if isinstance(obj, list) and obj and all(isinstance(item, dict) for item in obj):
+        fields = list(obj[0])
+        field_set = set(fields)
+        if fields and all(item.keys() == field_set for item in obj):
+            lines = ["fields: " + "|".join(_escape(field) for field in fields)]
+            for item in obj:
+                lines.append("|".join(_escape(item[field]) for field in fields))
+            return "\n".join(lines)
+
+    return _compact_json(obj)
+
+
+def compact_text(text: str) -> str:
+    """Reformat tool output that is a JSON document
+
+    Args:
+        text: Tool output
+
+    Returns:
+        The output in the format of to_toon if it is JSON, otherwise the
+        output unchanged
+    """
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "[{":
+        return text
+
+    try:
+        return to_toon(jsonutil.loads(stripped))
+    except jsonutil.JSONDecodeError:
+        return text